@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Hailo8 命令行入口
+用法: hailo8 <install|docker|test> [选项]，也可以 python3 -m hailo8_installer 运行
+"""
+
+import sys
+import importlib
+
+# 子命令 -> 实现该命令的模块（模块内提供 main()）
+COMMANDS = {
+    "install": "hailo8_installer.installer",
+    "docker": "hailo8_installer.docker_manager",
+    "test": "hailo8_installer.tester",
+}
+
+def main():
+    """主函数"""
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print("Hailo8 TPU 智能安装管理器")
+        print("用法: hailo8 <命令> [选项]")
+        print("命令:")
+        print("  install   安装 Hailo8 驱动和 HailoRT")
+        print("  docker    配置 Hailo8 Docker 环境")
+        print("  test      运行安装验证测试")
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help") else 2)
+    
+    command = sys.argv[1]
+    
+    # 各子命令自行解析 sys.argv，去掉子命令名后再交给它
+    sys.argv = [f"hailo8 {command}"] + sys.argv[2:]
+    return importlib.import_module(COMMANDS[command]).main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+HailoRT 探测操作
+测试进程能导入 hailo_platform 时直接调用各操作；否则以本文件作为常驻探测进程运行，
+通过 stdin/stdout 逐行交换 JSON 命令和结果。
+本模块只依赖标准库，可由与测试进程不同的解释器运行。
+"""
+
+import sys
+import json
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (是否成功, 输出行)
+ProbeResult = Tuple[bool, List[str]]
+
+def format_output(lines: List[str]) -> str:
+    """把输出行拼成与命令标准输出一致的文本"""
+    return ''.join(f"{line}\n" for line in lines)
+
+def op_version(hailo_platform: Any) -> ProbeResult:
+    """获取 HailoRT Python 版本"""
+    return True, [f"HailoRT Python 版本: {hailo_platform.__version__}"]
+
+def op_scan(hailo_platform: Any) -> ProbeResult:
+    """扫描 Hailo 设备"""
+    lines = []
+    try:
+        devices = hailo_platform.Device.scan()
+        lines.append(f"检测到 {len(devices)} 个 Hailo 设备")
+        lines.extend(f"设备 {i}: {device}" for i, device in enumerate(devices))
+    except Exception as e:
+        lines.append(f"设备扫描失败: {e}")
+    return True, lines
+
+def op_benchmark(hailo_platform: Any) -> ProbeResult:
+    """基本性能测试"""
+    lines = []
+    try:
+        devices = hailo_platform.Device.scan()
+        if not devices:
+            lines.append("未找到 Hailo 设备")
+            return False, lines
+        
+        device = devices[0]
+        lines.append(f"使用设备: {device}")
+        
+        # 测试设备初始化时间
+        start_time = time.time()
+        # 这里可以添加更多的性能测试代码
+        end_time = time.time()
+        
+        lines.append(f"设备初始化时间: {end_time - start_time:.3f} 秒")
+        lines.append("基本性能测试完成")
+        return True, lines
+    except Exception as e:
+        lines.append(f"性能测试失败: {e}")
+        return False, lines
+
+def _stress_device_test(hailo_platform: Any) -> bool:
+    """单次压力测试：扫描并占用设备"""
+    devices = hailo_platform.Device.scan()
+    if devices:
+        # 这里可以添加设备操作
+        time.sleep(1)
+        return True
+    return False
+
+def op_stress(hailo_platform: Any, executor: Optional[Executor] = None) -> ProbeResult:
+    """并发执行 5 次设备测试；传入 executor 时复用调用方的线程池"""
+    own_executor = executor is None
+    pool = ThreadPoolExecutor(max_workers=5) if executor is None else executor
+    try:
+        futures = [pool.submit(_stress_device_test, hailo_platform) for _ in range(5)]
+        success_count = sum(1 for future in futures if future.exception() is None and future.result())
+    finally:
+        if own_executor:
+            pool.shutdown()
+    
+    lines = [f"压力测试结果: {success_count}/5 成功"]
+    if success_count >= 4:
+        lines.append("压力测试通过")
+        return True, lines
+    lines.append("压力测试失败")
+    return False, lines
+
+OPS: Dict[str, Callable[[Any], ProbeResult]] = {
+    "version": op_version,
+    "scan": op_scan,
+    "benchmark": op_benchmark,
+    "stress": op_stress,
+}
+
+def main():
+    """常驻探测进程主循环"""
+    # 结果通道只写 JSON，hailo_platform 自身的输出转到 stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    
+    try:
+        import hailo_platform
+        import_error = None
+    except Exception as e:
+        hailo_platform = None
+        import_error = str(e)
+    
+    for line in sys.stdin:
+        command = json.loads(line)
+        try:
+            if hailo_platform is None:
+                raise ImportError(import_error)
+            ok, lines = OPS[command["op"]](hailo_platform)
+            response = {"ok": bool(ok), "stdout": format_output(lines), "stderr": ""}
+        except Exception as e:
+            response = {"ok": False, "stdout": "", "stderr": str(e)}
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Hailo8 TPU 安装管理器
 """
 
 import os
+import io
 import sys
 import json
 import time
@@ -14,13 +15,39 @@ import logging
 import subprocess
 import platform
 import hashlib
+import tarfile
+import functools
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from typing import IO, Dict, List, Optional, Set, Tuple, Any, cast
+from dataclasses import dataclass
 from enum import Enum
 import traceback
 
-class InstallStatus(Enum):
+# 安装状态文件格式版本及对应的软件版本
+STATE_SCHEMA_VERSION = 2
+HAILORT_VERSION = "4.23.0"
+DRIVER_VERSION = "4.23.0"
+
+# 安装包文件名
+PCIE_DRIVER_DEB = f"hailort-pcie-driver_{DRIVER_VERSION}_all.deb"
+HAILORT_DEB = f"hailort_{HAILORT_VERSION}_amd64.deb"
+HAILORT_WHEEL = f"hailort-{HAILORT_VERSION}-cp313-cp313-linux_x86_64.whl"
+
+# 安装状态有效期（秒），超过则视为过期
+STATE_MAX_AGE = 24 * 3600
+
+# Docker官方APT源
+DOCKER_GPG_URL = "https://download.docker.com/linux/ubuntu/gpg"
+DOCKER_KEYRING = "/usr/share/keyrings/docker-archive-keyring.gpg"
+DOCKER_SOURCES_LIST = "/etc/apt/sources.list.d/docker.list"
+
+# Python 3.10+ 为数据类启用 __slots__
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+class InstallStatus(str, Enum):
     """安装状态枚举"""
     PENDING = "pending"
     RUNNING = "running"
@@ -29,7 +56,7 @@ class InstallStatus(Enum):
     ROLLBACK = "rollback"
     RECOVERED = "recovered"
 
-class ComponentType(Enum):
+class ComponentType(str, Enum):
     """组件类型枚举"""
     SYSTEM_CHECK = "system_check"
     DEPENDENCIES = "dependencies"
@@ -38,7 +65,17 @@ class ComponentType(Enum):
     DOCKER_CONFIG = "docker_config"
     VALIDATION = "validation"
 
-@dataclass
+# 状态显示符号
+_STATUS_SYMBOL = {
+    InstallStatus.PENDING: "⏳",
+    InstallStatus.RUNNING: "🔄",
+    InstallStatus.SUCCESS: "✅",
+    InstallStatus.FAILED: "❌",
+    InstallStatus.ROLLBACK: "↩️",
+    InstallStatus.RECOVERED: "🔧"
+}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class InstallComponent:
     """安装组件数据类"""
     name: str
@@ -46,20 +83,111 @@ class InstallComponent:
     status: InstallStatus
     version: str = ""
     error_msg: str = ""
-    rollback_data: Dict[str, Any] = None
+    rollback_data: Optional[Dict[str, Any]] = None
     retry_count: int = 0
     max_retries: int = 3
 
+    def to_state(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的状态字典"""
+        return {
+            "name": self.name,
+            "type": self.type.value,
+            "status": self.status.value,
+            "version": self.version,
+            "error_msg": self.error_msg,
+            "rollback_data": self.rollback_data,
+            "retry_count": self.retry_count,
+            "max_retries": self.max_retries
+        }
+
+# 已确认存在的设备节点（只缓存找到的结果，驱动加载或重新验证时清空）
+_found_device_nodes: Set[str] = set()
+
+def _device_node_exists(node: str) -> bool:
+    """检查设备节点是否存在；未找到的节点每次都重新检查，驱动加载后即可发现"""
+    if node in _found_device_nodes:
+        return True
+    if os.path.exists(node):
+        _found_device_nodes.add(node)
+        return True
+    return False
+
+@functools.lru_cache(maxsize=1)
+def _get_distro_codename() -> str:
+    """从/etc/os-release读取发行版代号（替代lsb_release -cs）"""
+    info = {}
+    with open('/etc/os-release', 'r') as f:
+        for line in f:
+            if '=' in line:
+                key, value = line.strip().split('=', 1)
+                info[key] = value.strip('"')
+    return info.get('VERSION_CODENAME') or info.get('UBUNTU_CODENAME', '')
+
 class Hailo8Installer:
     """Hailo8 TPU 安装管理器主类"""
     
-    def __init__(self, install_dir: str = "/opt/hailo8"):
+    # 安装步骤：(组件名, 安装方法名)
+    _INSTALL_STEPS = (
+        ("system_check", "check_system_environment"),
+        ("dependencies", "install_dependencies"),
+        ("pcie_driver", "install_pcie_driver"),
+        ("hailort", "install_hailort"),
+        ("docker_config", "configure_docker"),
+        ("validation", "validate_installation"),
+    )
+    
+    # 系统环境检查方法名
+    _SYSTEM_CHECKS = (
+        "_check_linux_distribution",
+        "_check_kernel_version",
+        "_check_hardware_compatibility",
+        "_check_permissions",
+        "_check_disk_space",
+    )
+    
+    # 验证测试：(测试名, 测试方法名)
+    _VALIDATION_TESTS = (
+        ("驱动验证", "_test_driver"),
+        ("HailoRT验证", "_test_hailort"),
+        ("Docker验证", "_test_docker_integration"),
+        ("设备访问验证", "_test_device_access"),
+    )
+    
+    # 组件修复策略：组件名 -> 修复方法名
+    _REPAIR_METHODS = {
+        "system_check": "_repair_system_check",
+        "dependencies": "_repair_dependencies",
+        "pcie_driver": "_repair_pcie_driver",
+        "hailort": "_repair_hailort",
+        "docker_config": "_repair_docker_config",
+        "validation": "_repair_validation",
+    }
+    
+    # 回滚步骤：(步骤名, 命令)，按顺序在一个shell中执行
+    _ROLLBACK_STEPS = (
+        ("停止Docker服务", "systemctl stop docker"),
+        ("卸载驱动模块", "rmmod hailo_pci"),
+    )
+    
+    # 回滚卸载步骤：(步骤名, 命令)，相互独立，在上述步骤之后并行执行
+    # 两个DEB包在同一个dpkg进程中卸载，避免争用dpkg锁
+    _ROLLBACK_UNINSTALL_STEPS = (
+        ("卸载HailoRT软件包", ["dpkg", "-r", "hailort", "hailort-pcie-driver"]),
+        ("卸载HailoRT Python包", ["pip3", "uninstall", "-y", "hailort"]),
+    )
+    
+    def __init__(self, install_dir: str = "/opt/hailo8", state_max_age: float = STATE_MAX_AGE):
         self.install_dir = Path(install_dir)
+        self.state_max_age = state_max_age
         self.package_dir = Path(__file__).parent / "De"
         self.log_dir = self.install_dir / "logs"
         self.backup_dir = self.install_dir / "backup"
         self.state_file = self.install_dir / "install_state.json"
         
+        # 待安装的DEB包（DEB包 -> 所属组件）及本次运行已安装的DEB包
+        self._pending_debs: Dict[Path, str] = {}
+        self._installed_debs: Set[Path] = set()
+        
         # 创建必要目录
         self._create_directories()
         
@@ -76,8 +204,8 @@ class Hailo8Installer:
 
     def _create_directories(self):
         """创建必要的目录结构"""
-        for directory in [self.install_dir, self.log_dir, self.backup_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+        for directory in (self.install_dir, self.log_dir, self.backup_dir):
+            os.makedirs(directory, exist_ok=True)
 
     def _setup_logging(self):
         """设置日志系统"""
@@ -144,16 +272,19 @@ class Hailo8Installer:
         """保存安装状态到文件"""
         try:
             state_data = {
-                "components": {k: asdict(v) for k, v in self.components.items()},
+                "schema": STATE_SCHEMA_VERSION,
+                "hailort_version": HAILORT_VERSION,
+                "driver_version": DRIVER_VERSION,
+                "components": {k: v.to_state() for k, v in self.components.items()},
                 "timestamp": time.time(),
                 "install_dir": str(self.install_dir)
             }
             
             with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state_data, f, indent=2, ensure_ascii=False)
+                json.dump(state_data, f, separators=(",", ":"), ensure_ascii=False)
                 
         except Exception as e:
-            self.logger.error(f"保存状态失败: {e}")
+            self.logger.error("保存状态失败: %s", e)
 
     def _load_state(self):
         """从文件加载安装状态"""
@@ -162,6 +293,13 @@ class Hailo8Installer:
                 with open(self.state_file, 'r', encoding='utf-8') as f:
                     state_data = json.load(f)
                 
+                # 拒绝版本不匹配或已过期的状态
+                stale_reason = self._check_state_stale(state_data)
+                if stale_reason:
+                    self.logger.warning("忽略之前的安装状态: %s", stale_reason)
+                    self._archive_state_file()
+                    return
+                
                 # 恢复组件状态
                 for name, component_data in state_data.get("components", {}).items():
                     if name in self.components:
@@ -173,16 +311,44 @@ class Hailo8Installer:
                 self.logger.info("成功加载之前的安装状态")
                 
         except Exception as e:
-            self.logger.warning(f"加载状态失败，使用默认状态: {e}")
+            self.logger.warning("加载状态失败，使用默认状态: %s", e)
+
+    def _check_state_stale(self, state_data: Dict[str, Any]) -> Optional[str]:
+        """检查安装状态是否可用，返回不可用原因"""
+        if state_data.get("schema") != STATE_SCHEMA_VERSION:
+            return f"状态格式版本不匹配: {state_data.get('schema')}"
+        
+        if state_data.get("hailort_version") != HAILORT_VERSION:
+            return f"HailoRT版本不匹配: {state_data.get('hailort_version')}"
+        
+        if state_data.get("driver_version") != DRIVER_VERSION:
+            return f"驱动版本不匹配: {state_data.get('driver_version')}"
+        
+        age = time.time() - state_data.get("timestamp", 0)
+        if age > self.state_max_age:
+            return f"状态已过期 ({age / 3600:.1f} 小时前保存)"
+        
+        return None
+
+    def _archive_state_file(self):
+        """归档失效的安装状态文件"""
+        try:
+            archive_file = self.backup_dir / f"install_state_{int(time.time())}.json"
+            os.replace(self.state_file, archive_file)
+            self.logger.info("已归档失效的安装状态: %s", archive_file)
+        except Exception as e:
+            self.logger.warning("归档安装状态失败: %s", e)
 
     def _execute_command(self, command: List[str], timeout: int = 300, 
-                        capture_output: bool = True) -> Tuple[bool, str, str]:
+                        capture_output: bool = True,
+                        input: Optional[str] = None) -> Tuple[bool, str, str]:
         """执行系统命令，带超时和错误处理"""
         try:
-            self.logger.debug(f"执行命令: {' '.join(command)}")
+            self.logger.debug("执行命令: %s", ' '.join(command))
             
             result = subprocess.run(
                 command,
+                input=input,
                 capture_output=capture_output,
                 text=True,
                 timeout=timeout,
@@ -194,16 +360,16 @@ class Hailo8Installer:
             stderr = result.stderr if capture_output else ""
             
             if not success:
-                self.logger.error(f"命令执行失败 (返回码: {result.returncode})")
-                self.logger.error(f"错误输出: {stderr}")
+                self.logger.error("命令执行失败 (返回码: %s)", result.returncode)
+                self.logger.error("错误输出: %s", stderr)
             
             return success, stdout, stderr
             
         except subprocess.TimeoutExpired:
-            self.logger.error(f"命令执行超时: {' '.join(command)}")
+            self.logger.error("命令执行超时: %s", ' '.join(command))
             return False, "", "命令执行超时"
         except Exception as e:
-            self.logger.error(f"命令执行异常: {e}")
+            self.logger.error("命令执行异常: %s", e)
             return False, "", str(e)
 
     def _retry_operation(self, operation_func, component_name: str, *args, **kwargs) -> bool:
@@ -224,12 +390,12 @@ class Hailo8Installer:
                     return True
                 else:
                     component.retry_count += 1
-                    self.logger.warning(f"{component.name} 失败，重试 {component.retry_count}/{component.max_retries}")
+                    self.logger.warning("%s 失败，重试 %s/%s", component.name, component.retry_count, component.max_retries)
                     
             except Exception as e:
                 component.retry_count += 1
                 component.error_msg = str(e)
-                self.logger.error(f"{component.name} 异常: {e}")
+                self.logger.error("%s 异常: %s", component.name, e)
                 self.logger.debug(traceback.format_exc())
         
         # 所有重试都失败
@@ -241,16 +407,8 @@ class Hailo8Installer:
         """检查系统环境"""
         self.logger.info("开始系统环境检查...")
         
-        checks = [
-            self._check_linux_distribution,
-            self._check_kernel_version,
-            self._check_hardware_compatibility,
-            self._check_permissions,
-            self._check_disk_space
-        ]
-        
-        for check in checks:
-            if not check():
+        for check in self._SYSTEM_CHECKS:
+            if not getattr(self, check)():
                 return False
         
         self.logger.info("系统环境检查通过")
@@ -263,7 +421,7 @@ class Hailo8Installer:
             with open('/etc/os-release', 'r') as f:
                 os_info = f.read()
             
-            self.logger.info(f"检测到操作系统信息:\n{os_info}")
+            self.logger.info("检测到操作系统信息:\n%s", os_info)
             
             # 支持的发行版列表
             supported_distros = ['ubuntu', 'debian', 'centos', 'rhel', 'fedora']
@@ -271,21 +429,21 @@ class Hailo8Installer:
             os_info_lower = os_info.lower()
             for distro in supported_distros:
                 if distro in os_info_lower:
-                    self.logger.info(f"检测到支持的发行版: {distro}")
+                    self.logger.info("检测到支持的发行版: %s", distro)
                     return True
             
             self.logger.warning("未检测到明确支持的发行版，但将尝试继续安装")
             return True
             
         except Exception as e:
-            self.logger.error(f"检查Linux发行版失败: {e}")
+            self.logger.error("检查Linux发行版失败: %s", e)
             return False
 
     def _check_kernel_version(self) -> bool:
         """检查内核版本"""
         try:
             kernel_version = platform.release()
-            self.logger.info(f"内核版本: {kernel_version}")
+            self.logger.info("内核版本: %s", kernel_version)
             
             # 检查内核版本是否支持（一般4.0+都支持）
             version_parts = kernel_version.split('.')
@@ -295,11 +453,11 @@ class Hailo8Installer:
                 self.logger.info("内核版本检查通过")
                 return True
             else:
-                self.logger.error(f"内核版本过低: {kernel_version}，需要4.0+")
+                self.logger.error("内核版本过低: %s，需要4.0+", kernel_version)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"检查内核版本失败: {e}")
+            self.logger.error("检查内核版本失败: %s", e)
             return False
 
     def _check_hardware_compatibility(self) -> bool:
@@ -313,16 +471,16 @@ class Hailo8Installer:
             
             # 检查系统架构
             arch = platform.machine()
-            self.logger.info(f"系统架构: {arch}")
+            self.logger.info("系统架构: %s", arch)
             
             if arch in ['x86_64', 'amd64']:
                 return True
             else:
-                self.logger.warning(f"未测试的系统架构: {arch}")
+                self.logger.warning("未测试的系统架构: %s", arch)
                 return True  # 允许尝试
                 
         except Exception as e:
-            self.logger.error(f"硬件兼容性检查失败: {e}")
+            self.logger.error("硬件兼容性检查失败: %s", e)
             return False
 
     def _check_permissions(self) -> bool:
@@ -344,59 +502,49 @@ class Hailo8Installer:
             
             required_space_gb = 2.0  # 需要至少2GB空间
             
-            self.logger.info(f"可用磁盘空间: {free_space_gb:.2f} GB")
+            self.logger.info("可用磁盘空间: %.2f GB", free_space_gb)
             
             if free_space_gb >= required_space_gb:
                 return True
             else:
-                self.logger.error(f"磁盘空间不足，需要至少 {required_space_gb} GB")
+                self.logger.error("磁盘空间不足，需要至少 %s GB", required_space_gb)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"检查磁盘空间失败: {e}")
+            self.logger.error("检查磁盘空间失败: %s", e)
             return False
 
     def install_all(self) -> bool:
         """执行完整安装流程"""
         self.logger.info("开始Hailo8完整安装流程")
         
-        # 安装步骤列表
-        install_steps = [
-            ("system_check", self.check_system_environment),
-            ("dependencies", self.install_dependencies),
-            ("pcie_driver", self.install_pcie_driver),
-            ("hailort", self.install_hailort),
-            ("docker_config", self.configure_docker),
-            ("validation", self.validate_installation)
-        ]
-        
         # 执行每个安装步骤
-        for component_name, install_func in install_steps:
+        for component_name, install_method in self._INSTALL_STEPS:
             component = self.components[component_name]
             
             # 跳过已成功的组件
             if component.status == InstallStatus.SUCCESS:
-                self.logger.info(f"跳过已完成的组件: {component.name}")
+                self.logger.info("跳过已完成的组件: %s", component.name)
                 continue
             
-            self.logger.info(f"开始安装组件: {component.name}")
+            self.logger.info("开始安装组件: %s", component.name)
             
             # 使用重试机制执行安装
-            success = self._retry_operation(install_func, component_name)
+            success = self._retry_operation(getattr(self, install_method), component_name)
             
             if not success:
-                self.logger.error(f"组件安装失败: {component.name}")
-                self.logger.error(f"错误信息: {component.error_msg}")
+                self.logger.error("组件安装失败: %s", component.name)
+                self.logger.error("错误信息: %s", component.error_msg)
                 
                 # 尝试修复
                 if self._attempt_repair(component_name):
-                    self.logger.info(f"组件修复成功: {component.name}")
+                    self.logger.info("组件修复成功: %s", component.name)
                     continue
                 else:
-                    self.logger.error(f"组件修复失败: {component.name}")
+                    self.logger.error("组件修复失败: %s", component.name)
                     return False
             
-            self.logger.info(f"组件安装成功: {component.name}")
+            self.logger.info("组件安装成功: %s", component.name)
         
         self.logger.info("Hailo8安装流程完成")
         return True
@@ -423,7 +571,7 @@ class Hailo8Installer:
             self.logger.error("未找到支持的包管理器")
             return False
         
-        self.logger.info(f"使用包管理器: {current_pm}")
+        self.logger.info("使用包管理器: %s", current_pm)
         
         # 更新包列表
         if current_pm == "apt":
@@ -436,12 +584,12 @@ class Hailo8Installer:
         dependencies = self._get_dependencies_for_pm(current_pm)
         
         for dep in dependencies:
-            self.logger.info(f"安装依赖: {dep}")
+            self.logger.info("安装依赖: %s", dep)
             install_cmd = self._get_install_command(current_pm, dep)
             success, _, stderr = self._execute_command(install_cmd)
             
             if not success:
-                self.logger.warning(f"依赖安装失败: {dep}, 错误: {stderr}")
+                self.logger.warning("依赖安装失败: %s, 错误: %s", dep, stderr)
                 # 某些依赖可能已存在，继续安装其他依赖
         
         return True
@@ -483,45 +631,35 @@ class Hailo8Installer:
         self.logger.info("开始安装Hailo PCIe驱动...")
         
         # 查找驱动包
-        driver_package = self.package_dir / "hailort-pcie-driver_4.23.0_all.deb"
+        driver_package = self.package_dir / PCIE_DRIVER_DEB
         
         if not driver_package.exists():
-            self.logger.error(f"驱动包不存在: {driver_package}")
+            self.logger.error("驱动包不存在: %s", driver_package)
             return False
         
         # 备份当前驱动状态
         self._backup_driver_state()
         
-        # 安装驱动包
-        success, stdout, stderr = self._execute_command([
-            "dpkg", "-i", str(driver_package)
-        ])
+        # 与HailoRT DEB包合并为一次安装事务
+        self._queue_deb(driver_package, "pcie_driver")
+        self._queue_deb(self.package_dir / HAILORT_DEB, "hailort")
+        self._install_pending_debs()
         
-        if not success:
-            self.logger.error(f"驱动包安装失败: {stderr}")
-            # 尝试修复依赖
-            self._execute_command(["apt", "-f", "install", "-y"])
-            
-            # 重试安装
-            success, stdout, stderr = self._execute_command([
-                "dpkg", "-i", str(driver_package)
-            ])
-            
-            if not success:
-                self.logger.error("驱动安装重试失败")
-                return False
+        if driver_package not in self._installed_debs:
+            self.logger.error("驱动包安装失败")
+            return False
         
-        # 加载驱动模块
-        success = self._load_hailo_driver()
-        if not success:
+        # 加载并验证驱动模块；失败时重试需重新安装驱动包
+        if not self._load_hailo_driver():
+            self._installed_debs.discard(driver_package)
             return False
         
-        # 验证驱动安装
         if self._verify_driver_installation():
             self.logger.info("PCIe驱动安装成功")
             return True
         else:
             self.logger.error("PCIe驱动验证失败")
+            self._installed_debs.discard(driver_package)
             return False
 
     def _backup_driver_state(self):
@@ -542,7 +680,7 @@ class Hailo8Installer:
                     f.write(stdout)
                     
         except Exception as e:
-            self.logger.warning(f"备份驱动状态失败: {e}")
+            self.logger.warning("备份驱动状态失败: %s", e)
 
     def _load_hailo_driver(self) -> bool:
         """加载Hailo驱动模块"""
@@ -552,9 +690,10 @@ class Hailo8Installer:
             
             if success:
                 self.logger.info("Hailo驱动模块加载成功")
+                _found_device_nodes.clear()
                 return True
             else:
-                self.logger.error(f"驱动模块加载失败: {stderr}")
+                self.logger.error("驱动模块加载失败: %s", stderr)
                 
                 # 尝试手动加载
                 driver_files = [
@@ -565,13 +704,14 @@ class Hailo8Installer:
                 for driver_file in driver_files:
                     success, _, _ = self._execute_command(["insmod", driver_file])
                     if success:
-                        self.logger.info(f"手动加载驱动成功: {driver_file}")
+                        self.logger.info("手动加载驱动成功: %s", driver_file)
+                        _found_device_nodes.clear()
                         return True
                 
                 return False
                 
         except Exception as e:
-            self.logger.error(f"加载驱动异常: {e}")
+            self.logger.error("加载驱动异常: %s", e)
             return False
 
     def _verify_driver_installation(self) -> bool:
@@ -585,8 +725,8 @@ class Hailo8Installer:
                 # 检查设备节点
                 device_nodes = ["/dev/hailo0", "/dev/hailo_pci"]
                 for node in device_nodes:
-                    if os.path.exists(node):
-                        self.logger.info(f"检测到设备节点: {node}")
+                    if _device_node_exists(node):
+                        self.logger.info("检测到设备节点: %s", node)
                         return True
                 
                 # 检查PCIe设备
@@ -598,22 +738,25 @@ class Hailo8Installer:
             return False
             
         except Exception as e:
-            self.logger.error(f"验证驱动安装异常: {e}")
+            self.logger.error("验证驱动安装异常: %s", e)
             return False
 
     def install_hailort(self) -> bool:
         """安装HailoRT运行时"""
         self.logger.info("开始安装HailoRT运行时...")
         
-        # 安装DEB包
-        hailort_deb = self.package_dir / "hailort_4.23.0_amd64.deb"
-        if hailort_deb.exists():
-            success = self._install_hailort_deb(hailort_deb)
-            if not success:
+        # 安装DEB包（可能已随PCIe驱动一并安装）
+        hailort_deb = self.package_dir / HAILORT_DEB
+        if hailort_deb in self._installed_debs:
+            self.logger.info("HailoRT DEB包已在PCIe驱动的安装事务中安装: %s", hailort_deb.name)
+        elif hailort_deb.exists():
+            self._queue_deb(hailort_deb, "hailort")
+            self._install_pending_debs()
+            if hailort_deb not in self._installed_debs:
                 return False
         
         # 安装Python包
-        hailort_whl = self.package_dir / "hailort-4.23.0-cp313-cp313-linux_x86_64.whl"
+        hailort_whl = self.package_dir / HAILORT_WHEEL
         if hailort_whl.exists():
             success = self._install_hailort_python(hailort_whl)
             if not success:
@@ -622,17 +765,60 @@ class Hailo8Installer:
         # 验证安装
         return self._verify_hailort_installation()
 
-    def _install_hailort_deb(self, package_path: Path) -> bool:
-        """安装HailoRT DEB包"""
+    def _queue_deb(self, package_path: Path, component_name: str):
+        """将DEB包加入待安装队列，并记录其所属组件"""
+        if (package_path.exists() and package_path not in self._installed_debs
+                and package_path not in self._pending_debs):
+            self._pending_debs[package_path] = component_name
+    
+    def _mark_deb_installed(self, package_path: Path, component_name: str):
+        """记录已安装的DEB包，并保存到所属组件的状态中"""
+        self._installed_debs.add(package_path)
+        component = self.components[component_name]
+        component.rollback_data = dict(component.rollback_data or {}, deb_package=str(package_path))
+        self.logger.info("DEB包已安装: %s（%s）", package_path.name, component.name)
+
+    def _install_pending_debs(self) -> bool:
+        """在一次apt事务中安装所有待安装的DEB包，失败时逐个安装以定位问题包"""
+        if not self._pending_debs:
+            return True
+        
+        packages = [str(p.resolve()) for p in self._pending_debs]
+        self.logger.info("合并安装DEB包: %s", ', '.join(
+            f"{path.name}（{self.components[name].name}）" for path, name in self._pending_debs.items()
+        ))
+        
+        success, _, stderr = self._execute_command([
+            "apt-get", "install", "-y", "--no-install-recommends", *packages
+        ])
+        
+        if success:
+            for package_path, component_name in self._pending_debs.items():
+                self._mark_deb_installed(package_path, component_name)
+            self._pending_debs.clear()
+            return True
+        
+        self.logger.warning("批量安装DEB包失败，改为逐个安装: %s", stderr)
+        all_success = True
+        for package_path, component_name in self._pending_debs.items():
+            if self._install_deb(package_path):
+                self._mark_deb_installed(package_path, component_name)
+            else:
+                all_success = False
+        self._pending_debs.clear()
+        return all_success
+
+    def _install_deb(self, package_path: Path) -> bool:
+        """使用dpkg安装单个DEB包"""
         try:
-            self.logger.info(f"安装HailoRT DEB包: {package_path}")
+            self.logger.info("安装DEB包: %s", package_path)
             
             success, _, stderr = self._execute_command([
                 "dpkg", "-i", str(package_path)
             ])
             
             if not success:
-                self.logger.warning(f"DEB包安装失败，尝试修复依赖: {stderr}")
+                self.logger.warning("DEB包安装失败，尝试修复依赖: %s", stderr)
                 self._execute_command(["apt", "-f", "install", "-y"])
                 
                 # 重试安装
@@ -641,34 +827,34 @@ class Hailo8Installer:
                 ])
                 
                 if not success:
-                    self.logger.error(f"DEB包安装重试失败: {stderr}")
+                    self.logger.error("DEB包安装重试失败: %s: %s", package_path, stderr)
                     return False
             
-            self.logger.info("HailoRT DEB包安装成功")
+            self.logger.info("DEB包安装成功: %s", package_path.name)
             return True
             
         except Exception as e:
-            self.logger.error(f"安装HailoRT DEB包异常: {e}")
+            self.logger.error("安装DEB包异常: %s", e)
             return False
 
     def _install_hailort_python(self, package_path: Path) -> bool:
         """安装HailoRT Python包"""
         try:
-            self.logger.info(f"安装HailoRT Python包: {package_path}")
+            self.logger.info("安装HailoRT Python包: %s", package_path)
             
             success, _, stderr = self._execute_command([
                 "pip3", "install", str(package_path)
             ])
             
             if not success:
-                self.logger.error(f"Python包安装失败: {stderr}")
+                self.logger.error("Python包安装失败: %s", stderr)
                 return False
             
             self.logger.info("HailoRT Python包安装成功")
             return True
             
         except Exception as e:
-            self.logger.error(f"安装HailoRT Python包异常: {e}")
+            self.logger.error("安装HailoRT Python包异常: %s", e)
             return False
 
     def _verify_hailort_installation(self) -> bool:
@@ -692,7 +878,7 @@ class Hailo8Installer:
                 return False
                 
         except Exception as e:
-            self.logger.error(f"验证HailoRT安装异常: {e}")
+            self.logger.error("验证HailoRT安装异常: %s", e)
             return False
 
     def configure_docker(self) -> bool:
@@ -720,16 +906,22 @@ class Hailo8Installer:
         """安装Docker"""
         try:
             # 添加Docker官方GPG密钥
-            success, _, _ = self._execute_command([
-                "curl", "-fsSL", "https://download.docker.com/linux/ubuntu/gpg", 
-                "|", "gpg", "--dearmor", "-o", "/usr/share/keyrings/docker-archive-keyring.gpg"
-            ])
+            with urllib.request.urlopen(DOCKER_GPG_URL, timeout=30) as response:
+                gpg_key = response.read().decode('ascii')
+            
+            success, _, stderr = self._execute_command(
+                ["gpg", "--batch", "--yes", "--dearmor", "-o", DOCKER_KEYRING],
+                input=gpg_key
+            )
+            if not success:
+                self.logger.error("导入Docker GPG密钥失败: %s", stderr)
+                return False
             
             # 添加Docker仓库
-            success, _, _ = self._execute_command([
-                "echo", "deb [arch=amd64 signed-by=/usr/share/keyrings/docker-archive-keyring.gpg] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable",
-                "|", "tee", "/etc/apt/sources.list.d/docker.list"
-            ])
+            Path(DOCKER_SOURCES_LIST).write_text(
+                f"deb [arch=amd64 signed-by={DOCKER_KEYRING}] "
+                f"https://download.docker.com/linux/ubuntu {_get_distro_codename()} stable\n"
+            )
             
             # 更新包列表
             self._execute_command(["apt", "update"])
@@ -740,7 +932,7 @@ class Hailo8Installer:
             ])
             
             if not success:
-                self.logger.error(f"Docker安装失败: {stderr}")
+                self.logger.error("Docker安装失败: %s", stderr)
                 return False
             
             # 启动Docker服务
@@ -751,7 +943,7 @@ class Hailo8Installer:
             return True
             
         except Exception as e:
-            self.logger.error(f"安装Docker异常: {e}")
+            self.logger.error("安装Docker异常: %s", e)
             return False
 
     def _configure_docker_device_access(self) -> bool:
@@ -783,7 +975,7 @@ class Hailo8Installer:
             return True
             
         except Exception as e:
-            self.logger.error(f"配置Docker设备访问异常: {e}")
+            self.logger.error("配置Docker设备访问异常: %s", e)
             return False
 
     def _create_hailo_docker_image(self) -> bool:
@@ -816,51 +1008,90 @@ WORKDIR /app
 CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')"]
 """
             
-            # 创建Dockerfile
-            dockerfile_path = Path("Dockerfile.hailo")
-            with open(dockerfile_path, 'w') as f:
-                f.write(dockerfile_content)
-            
-            # 构建Docker镜像
-            success, _, stderr = self._execute_command([
-                "docker", "build", "-f", "Dockerfile.hailo", "-t", "hailo8:latest", "."
-            ])
+            # 构建上下文只包含Dockerfile和所需的安装包，直接流式写入docker build的标准输入
+            success, stderr = self._docker_build_from_context(dockerfile_content)
             
             if not success:
-                self.logger.error(f"Docker镜像构建失败: {stderr}")
+                self.logger.error("Docker镜像构建失败: %s", stderr)
                 return False
             
             self.logger.info("Hailo Docker镜像创建成功")
             return True
             
         except Exception as e:
-            self.logger.error(f"创建Docker镜像异常: {e}")
+            self.logger.error("创建Docker镜像异常: %s", e)
             return False
 
+    def _docker_build_from_context(self, dockerfile_content: str, timeout: int = 300) -> Tuple[bool, str]:
+        """边打包边把构建上下文写入 docker build -，不在磁盘或内存中缓存整个tar"""
+        command = ["docker", "build", "-t", "hailo8:latest", "-"]
+        self.logger.debug("执行命令: %s", ' '.join(command))
+        
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        # 两个管道均以 PIPE 创建，一定存在
+        stdin_pipe = cast(IO[bytes], process.stdin)
+        stderr_pipe = cast(IO[bytes], process.stderr)
+        
+        # 后台线程读取错误输出，避免docker写满stderr管道后不再读取标准输入
+        stderr_chunks: List[bytes] = []
+        reader = threading.Thread(target=lambda: stderr_chunks.append(stderr_pipe.read()), daemon=True)
+        reader.start()
+        
+        try:
+            with stdin_pipe, tarfile.open(fileobj=stdin_pipe, mode="w|") as tar:
+                dockerfile_data = dockerfile_content.encode('utf-8')
+                dockerfile_info = tarfile.TarInfo("Dockerfile")
+                dockerfile_info.size = len(dockerfile_data)
+                dockerfile_info.mtime = int(time.time())
+                tar.addfile(dockerfile_info, io.BytesIO(dockerfile_data))
+                
+                for package_name in (HAILORT_DEB, HAILORT_WHEEL):
+                    tar.add(self.package_dir / package_name, arcname=f"De/{package_name}")
+        except BrokenPipeError:
+            # docker提前退出，原因见其错误输出
+            pass
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            self.logger.error("命令执行超时: %s", ' '.join(command))
+            return False, "命令执行超时"
+        
+        reader.join()
+        stderr = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+        return returncode == 0, stderr
+
     def validate_installation(self) -> bool:
         """验证完整安装"""
         self.logger.info("开始验证Hailo8安装...")
         
-        validation_tests = [
-            ("驱动验证", self._test_driver),
-            ("HailoRT验证", self._test_hailort),
-            ("Docker验证", self._test_docker_integration),
-            ("设备访问验证", self._test_device_access)
-        ]
+        # 重新验证时不沿用上一轮找到的设备节点（驱动可能已被卸载）
+        _found_device_nodes.clear()
         
         all_passed = True
-        for test_name, test_func in validation_tests:
-            self.logger.info(f"执行测试: {test_name}")
+        for test_name, test_method in self._VALIDATION_TESTS:
+            self.logger.info("执行测试: %s", test_name)
             
             try:
-                result = test_func()
+                result = getattr(self, test_method)()
                 if result:
-                    self.logger.info(f"✓ {test_name} 通过")
+                    self.logger.info("✓ %s 通过", test_name)
                 else:
-                    self.logger.error(f"✗ {test_name} 失败")
+                    self.logger.error("✗ %s 失败", test_name)
                     all_passed = False
             except Exception as e:
-                self.logger.error(f"✗ {test_name} 异常: {e}")
+                self.logger.error("✗ %s 异常: %s", test_name, e)
                 all_passed = False
         
         if all_passed:
@@ -893,7 +1124,7 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
         """测试设备访问"""
         device_nodes = ["/dev/hailo0", "/dev/hailo_pci"]
         for node in device_nodes:
-            if os.path.exists(node):
+            if _device_node_exists(node):
                 return True
         return False
 
@@ -901,14 +1132,7 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
         """显示安装状态"""
         print("\n=== Hailo8 安装状态 ===")
         for name, component in self.components.items():
-            status_symbol = {
-                InstallStatus.PENDING: "⏳",
-                InstallStatus.RUNNING: "🔄",
-                InstallStatus.SUCCESS: "✅",
-                InstallStatus.FAILED: "❌",
-                InstallStatus.ROLLBACK: "↩️",
-                InstallStatus.RECOVERED: "🔧"
-            }.get(component.status, "❓")
+            status_symbol = _STATUS_SYMBOL.get(component.status, "❓")
             
             print(f"{status_symbol} {component.name}: {component.status.value}")
             if component.error_msg:
@@ -918,20 +1142,41 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
         """回滚安装"""
         self.logger.info("开始回滚Hailo8安装...")
         
-        # 停止相关服务
-        self._execute_command(["systemctl", "stop", "docker"])
+        # 停止服务和卸载模块需按顺序在一个shell中执行，单步失败不影响后续步骤
+        script = "; ".join(
+            f'{command}; echo "::step:{index}:$?"'
+            for index, (_, command) in enumerate(self._ROLLBACK_STEPS)
+        )
+        _, stdout, _ = self._execute_command(["bash", "-c", script])
         
-        # 卸载驱动模块
-        self._execute_command(["rmmod", "hailo_pci"])
+        # 解析每一步的返回码
+        step_codes: Dict[int, int] = {}
+        for line in stdout.splitlines():
+            if line.startswith("::step:"):
+                step, rc = line[len("::step:"):].split(":", 1)
+                step_codes[int(step)] = int(rc)
         
-        # 卸载软件包
-        self._execute_command(["dpkg", "-r", "hailort"])
-        self._execute_command(["dpkg", "-r", "hailort-pcie-driver"])
+        for index, (step_name, _) in enumerate(self._ROLLBACK_STEPS):
+            code = step_codes.get(index)
+            if code == 0:
+                self.logger.info("回滚步骤完成: %s", step_name)
+            else:
+                self.logger.warning("回滚步骤失败: %s (返回码: %s)", step_name, code)
         
-        # 清理Python包
-        self._execute_command(["pip3", "uninstall", "-y", "hailort"])
+        # 并行卸载软件包和Python包
+        with ThreadPoolExecutor(max_workers=len(self._ROLLBACK_UNINSTALL_STEPS)) as executor:
+            results = executor.map(
+                self._execute_command,
+                [command for _, command in self._ROLLBACK_UNINSTALL_STEPS]
+            )
+            for (step_name, _), (success, _, _) in zip(self._ROLLBACK_UNINSTALL_STEPS, results):
+                if success:
+                    self.logger.info("回滚步骤完成: %s", step_name)
+                else:
+                    self.logger.warning("回滚步骤失败: %s", step_name)
         
         # 重置组件状态
+        self._installed_debs.clear()
         for component in self.components.values():
             component.status = InstallStatus.PENDING
             component.error_msg = ""
@@ -943,31 +1188,27 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
 
     def _attempt_repair(self, component_name: str) -> bool:
         """尝试修复失败的组件"""
-        self.logger.info(f"尝试修复组件: {component_name}")
-        
-        component = self.components[component_name]
+        self.logger.info("尝试修复组件: %s", component_name)
         
         # 根据组件类型执行不同的修复策略
-        repair_strategies = {
-            "system_check": self._repair_system_check,
-            "dependencies": self._repair_dependencies,
-            "pcie_driver": self._repair_pcie_driver,
-            "hailort": self._repair_hailort,
-            "docker_config": self._repair_docker_config,
-            "validation": self._repair_validation
-        }
-        
-        repair_func = repair_strategies.get(component_name)
-        if repair_func:
-            return repair_func()
+        repair_method = self._REPAIR_METHODS.get(component_name)
+        if repair_method:
+            return getattr(self, repair_method)()
         
         return False
 
     def _repair_system_check(self) -> bool:
         """修复系统检查"""
-        # 尝试安装缺失的系统工具
+        # 只安装缺失的系统工具
+        missing = [
+            package for package, binary in (("lsb-release", "lsb_release"), ("pciutils", "lspci"))
+            if not shutil.which(binary)
+        ]
+        if not missing:
+            return True
+        
         self._execute_command(["apt", "update"])
-        self._execute_command(["apt", "install", "-y", "lsb-release", "pciutils"])
+        self._execute_command(["apt", "install", "-y", *missing])
         return True
 
     def _repair_dependencies(self) -> bool:
@@ -986,6 +1227,7 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
     def _repair_hailort(self) -> bool:
         """修复HailoRT"""
         # 重新安装HailoRT
+        self._installed_debs.discard(self.package_dir / HAILORT_DEB)
         return self.install_hailort()
 
     def _repair_docker_config(self) -> bool:
@@ -1000,7 +1242,8 @@ CMD ["python3", "-c", "import hailo_platform; print('Hailo8 Docker环境就绪')
         self._execute_command(["rmmod", "hailo_pci"])
         return self._load_hailo_driver()
 
-if __name__ == "__main__":
+def main():
+    """主函数"""
     try:
         installer = Hailo8Installer()
         
@@ -1020,4 +1263,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"安装程序异常: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
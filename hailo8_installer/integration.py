@@ -8,8 +8,10 @@ import os
 import sys
 import json
 import yaml
+import stat
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
@@ -19,203 +21,13 @@ from .docker_manager import DockerHailo8Manager
 from .tester import Hailo8Tester
 from .utils import setup_logging, get_system_info
 
-@dataclass
-class IntegrationConfig:
-    """集成配置类"""
-    project_name: str
-    project_path: str
-    hailo8_enabled: bool = True
-    docker_enabled: bool = True
-    auto_install: bool = False
-    config_file: Optional[str] = None
-    log_level: str = "INFO"
-    custom_settings: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.custom_settings is None:
-            self.custom_settings = {}
+# 优先使用 libyaml 的 C 实现（PyYAML 未编译 libyaml 时不提供 CSafeDumper）
+_Dumper: Any = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
-class ProjectIntegrator:
-    """项目集成器"""
-    
-    def __init__(self, config: IntegrationConfig):
-        self.config = config
-        self.logger = setup_logging(level=config.log_level)
-        self.installer = None
-        self.docker_manager = None
-        self.tester = None
-        
-        # 初始化组件
-        self._initialize_components()
-    
-    def _initialize_components(self):
-        """初始化组件"""
-        try:
-            # 创建安装器
-            install_dir = os.path.join(self.config.project_path, 'hailo8')
-            self.installer = Hailo8Installer(install_dir=install_dir)
-            
-            # 创建Docker管理器
-            if self.config.docker_enabled:
-                self.docker_manager = DockerHailo8Manager()
-            
-            # 创建测试器
-            self.tester = Hailo8Tester()
-            
-            self.logger.info(f"项目集成器初始化完成: {self.config.project_name}")
-            
-        except Exception as e:
-            self.logger.error(f"项目集成器初始化失败: {e}")
-            raise
-    
-    def integrate_with_project(self) -> bool:
-        """与项目集成"""
-        self.logger.info(f"开始与项目集成: {self.config.project_name}")
-        
-        try:
-            # 1. 创建项目目录结构
-            if not self._setup_project_structure():
-                return False
-            
-            # 2. 生成配置文件
-            if not self._generate_config_files():
-                return False
-            
-            # 3. 创建集成脚本
-            if not self._create_integration_scripts():
-                return False
-            
-            # 4. 生成文档
-            if not self._generate_documentation():
-                return False
-            
-            # 5. 自动安装（如果启用）
-            if self.config.auto_install:
-                if not self._auto_install_hailo8():
-                    self.logger.warning("自动安装失败，但集成继续")
-            
-            self.logger.info("项目集成完成")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"项目集成失败: {e}")
-            return False
-    
-    def _setup_project_structure(self) -> bool:
-        """设置项目目录结构"""
-        try:
-            base_path = Path(self.config.project_path)
-            
-            # 创建必要目录
-            directories = [
-                'hailo8',
-                'hailo8/config',
-                'hailo8/scripts',
-                'hailo8/logs',
-                'hailo8/docker',
-                'hailo8/tests'
-            ]
-            
-            for directory in directories:
-                dir_path = base_path / directory
-                dir_path.mkdir(parents=True, exist_ok=True)
-                self.logger.debug(f"创建目录: {dir_path}")
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"设置项目结构失败: {e}")
-            return False
-    
-    def _generate_config_files(self) -> bool:
-        """生成配置文件"""
-        try:
-            config_dir = Path(self.config.project_path) / 'hailo8' / 'config'
-            
-            # 生成主配置文件
-            main_config = {
-                'project': {
-                    'name': self.config.project_name,
-                    'hailo8_enabled': self.config.hailo8_enabled,
-                    'docker_enabled': self.config.docker_enabled
-                },
-                'hailo8': {
-                    'install_dir': str(Path(self.config.project_path) / 'hailo8'),
-                    'auto_install': self.config.auto_install,
-                    'log_level': self.config.log_level
-                },
-                'docker': {
-                    'enabled': self.config.docker_enabled,
-                    'image_name': f"{self.config.project_name.lower()}-hailo8",
-                    'container_name': f"{self.config.project_name.lower()}-hailo8-container"
-                },
-                'custom': self.config.custom_settings
-            }
-            
-            # 保存为YAML格式
-            config_file = config_dir / 'hailo8_integration.yaml'
-            with open(config_file, 'w', encoding='utf-8') as f:
-                yaml.dump(main_config, f, default_flow_style=False, allow_unicode=True)
-            
-            self.logger.info(f"配置文件已生成: {config_file}")
-            
-            # 生成环境变量文件
-            env_file = config_dir / 'hailo8.env'
-            with open(env_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Hailo8 环境变量配置\n")
-                f.write(f"PROJECT_NAME={self.config.project_name}\n")
-                f.write(f"HAILO8_ENABLED={self.config.hailo8_enabled}\n")
-                f.write(f"DOCKER_ENABLED={self.config.docker_enabled}\n")
-                f.write(f"HAILO8_INSTALL_DIR={Path(self.config.project_path) / 'hailo8'}\n")
-                f.write(f"LOG_LEVEL={self.config.log_level}\n")
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"生成配置文件失败: {e}")
-            return False
-    
-    def _create_integration_scripts(self) -> bool:
-        """创建集成脚本"""
-        try:
-            scripts_dir = Path(self.config.project_path) / 'hailo8' / 'scripts'
-            
-            # 创建安装脚本
-            install_script = scripts_dir / 'install_hailo8.py'
-            with open(install_script, 'w', encoding='utf-8') as f:
-                f.write(self._generate_install_script())
-            
-            # 创建测试脚本
-            test_script = scripts_dir / 'test_hailo8.py'
-            with open(test_script, 'w', encoding='utf-8') as f:
-                f.write(self._generate_test_script())
-            
-            # 创建Docker脚本
-            if self.config.docker_enabled:
-                docker_script = scripts_dir / 'docker_hailo8.py'
-                with open(docker_script, 'w', encoding='utf-8') as f:
-                    f.write(self._generate_docker_script())
-            
-            # 创建启动脚本
-            startup_script = scripts_dir / 'startup.sh'
-            with open(startup_script, 'w', encoding='utf-8') as f:
-                f.write(self._generate_startup_script())
-            
-            # 设置执行权限
-            os.chmod(startup_script, 0o755)
-            
-            self.logger.info("集成脚本已创建")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"创建集成脚本失败: {e}")
-            return False
-    
-    def _generate_install_script(self) -> str:
-        """生成安装脚本内容"""
-        return f'''#!/usr/bin/env python3
+# 安装脚本模板
+_INSTALL_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
 """
-{self.config.project_name} - Hailo8 安装脚本
+{project_name} - Hailo8 安装脚本
 自动生成的集成脚本
 """
 
@@ -231,7 +43,7 @@ from hailo8_installer import install_hailo8, setup_logging
 def main():
     """主函数"""
     # 设置日志
-    logger = setup_logging(level="{self.config.log_level}")
+    logger = setup_logging(level="{log_level}")
     
     # 配置安装参数
     install_dir = Path(__file__).parent.parent
@@ -255,12 +67,11 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 '''
-    
-    def _generate_test_script(self) -> str:
-        """生成测试脚本内容"""
-        return f'''#!/usr/bin/env python3
+
+# 测试脚本模板
+_TEST_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
 """
-{self.config.project_name} - Hailo8 测试脚本
+{project_name} - Hailo8 测试脚本
 自动生成的集成脚本
 """
 
@@ -276,7 +87,7 @@ from hailo8_installer import test_hailo8, setup_logging
 def main():
     """主函数"""
     # 设置日志
-    logger = setup_logging(level="{self.config.log_level}")
+    logger = setup_logging(level="{log_level}")
     
     logger.info("开始测试Hailo8...")
     
@@ -293,12 +104,11 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 '''
-    
-    def _generate_docker_script(self) -> str:
-        """生成Docker脚本内容"""
-        return f'''#!/usr/bin/env python3
+
+# Docker脚本模板
+_DOCKER_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
 """
-{self.config.project_name} - Hailo8 Docker脚本
+{project_name} - Hailo8 Docker脚本
 自动生成的集成脚本
 """
 
@@ -314,14 +124,14 @@ from hailo8_installer import setup_docker, setup_logging
 def main():
     """主函数"""
     # 设置日志
-    logger = setup_logging(level="{self.config.log_level}")
+    logger = setup_logging(level="{log_level}")
     
     logger.info("开始设置Hailo8 Docker环境...")
     
     # 执行Docker设置
     success = setup_docker(
-        image_name="{self.config.project_name.lower()}-hailo8",
-        container_name="{self.config.project_name.lower()}-hailo8-container"
+        image_name="{project_slug}-hailo8",
+        container_name="{project_slug}-hailo8-container"
     )
     
     if success:
@@ -334,11 +144,10 @@ def main():
 if __name__ == "__main__":
     sys.exit(main())
 '''
-    
-    def _generate_startup_script(self) -> str:
-        """生成启动脚本内容"""
-        return f'''#!/bin/bash
-# {self.config.project_name} - Hailo8 启动脚本
+
+# 启动脚本模板
+_STARTUP_SCRIPT_TEMPLATE = '''#!/bin/bash
+# {project_name} - Hailo8 启动脚本
 # 自动生成的集成脚本
 
 set -e
@@ -346,7 +155,7 @@ set -e
 SCRIPT_DIR="$(cd "$(dirname "${{BASH_SOURCE[0]}}")" && pwd)"
 PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
 
-echo "=== {self.config.project_name} Hailo8 启动脚本 ==="
+echo "=== {project_name} Hailo8 启动脚本 ==="
 
 # 加载环境变量
 if [ -f "$PROJECT_DIR/config/hailo8.env" ]; then
@@ -373,36 +182,11 @@ fi
 
 echo "=== 启动完成 ==="
 '''
-    
-    def _generate_documentation(self) -> bool:
-        """生成文档"""
-        try:
-            project_dir = Path(self.config.project_path)
-            
-            # 生成集成说明文档
-            readme_content = self._generate_integration_readme()
-            readme_file = project_dir / 'hailo8' / 'README.md'
-            with open(readme_file, 'w', encoding='utf-8') as f:
-                f.write(readme_content)
-            
-            # 生成API文档
-            api_doc_content = self._generate_api_documentation()
-            api_doc_file = project_dir / 'hailo8' / 'API.md'
-            with open(api_doc_file, 'w', encoding='utf-8') as f:
-                f.write(api_doc_content)
-            
-            self.logger.info("文档已生成")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"生成文档失败: {e}")
-            return False
-    
-    def _generate_integration_readme(self) -> str:
-        """生成集成说明文档"""
-        return f'''# {self.config.project_name} - Hailo8 集成
 
-本文档说明如何在 {self.config.project_name} 项目中使用 Hailo8 TPU。
+# 集成说明文档模板
+_INTEGRATION_README_TEMPLATE = '''# {project_name} - Hailo8 集成
+
+本文档说明如何在 {project_name} 项目中使用 Hailo8 TPU。
 
 ## 概述
 
@@ -464,19 +248,19 @@ python3 docker_hailo8.py
 
 ```yaml
 project:
-  name: {self.config.project_name}
-  hailo8_enabled: {self.config.hailo8_enabled}
-  docker_enabled: {self.config.docker_enabled}
+  name: {project_name}
+  hailo8_enabled: {hailo8_enabled}
+  docker_enabled: {docker_enabled}
 
 hailo8:
   install_dir: ./hailo8
-  auto_install: {self.config.auto_install}
-  log_level: {self.config.log_level}
+  auto_install: {auto_install}
+  log_level: {log_level}
 
 docker:
-  enabled: {self.config.docker_enabled}
-  image_name: {self.config.project_name.lower()}-hailo8
-  container_name: {self.config.project_name.lower()}-hailo8-container
+  enabled: {docker_enabled}
+  image_name: {project_slug}-hailo8
+  container_name: {project_slug}-hailo8-container
 ```
 
 ## Python API
@@ -536,10 +320,9 @@ cd scripts
 python3 install_hailo8.py --update
 ```
 '''
-    
-    def _generate_api_documentation(self) -> str:
-        """生成API文档"""
-        return f'''# {self.config.project_name} - Hailo8 API 文档
+
+# API文档模板
+_API_DOCUMENTATION_TEMPLATE = '''# {project_name} - Hailo8 API 文档
 
 本文档描述了 Hailo8 集成提供的 Python API。
 
@@ -793,27 +576,290 @@ installer = Hailo8Installer(config=config)
 success = installer.install()
 ```
 '''
+
+@dataclass
+class IntegrationConfig:
+    """集成配置类"""
+    project_name: str
+    project_path: str
+    hailo8_enabled: bool = True
+    docker_enabled: bool = True
+    auto_install: bool = False
+    config_file: Optional[str] = None
+    log_level: str = "INFO"
+    custom_settings: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        if self.custom_settings is None:
+            self.custom_settings = {}
+
+class ProjectIntegrator:
+    """项目集成器"""
+    
+    # 模板中布尔值按YAML格式渲染
+    _YAML_BOOL = {True: 'true', False: 'false'}
+    
+    def __init__(self, config: IntegrationConfig):
+        self.config = config
+        self.logger = setup_logging(level=config.log_level)
+        self.installer = None
+        self.docker_manager = None
+        self.tester = None
+        
+        # 初始化组件
+        self._initialize_components()
     
-    def _auto_install_hailo8(self) -> bool:
-        """自动安装Hailo8"""
+    def _initialize_components(self):
+        """初始化组件"""
         try:
-            self.logger.info("开始自动安装Hailo8...")
+            # 缓存项目路径
+            self._base = Path(self.config.project_path)
+            self._hailo_root = self._base / 'hailo8'
+            self._config_dir = self._hailo_root / 'config'
+            self._scripts_dir = self._hailo_root / 'scripts'
             
-            if self.installer:
-                success = self.installer.install()
-                if success:
+            # 创建安装器
+            self.installer = Hailo8Installer(install_dir=str(self._hailo_root))
+            
+            # 创建Docker管理器
+            if self.config.docker_enabled:
+                self.docker_manager = DockerHailo8Manager()
+            
+            # 创建测试器
+            self.tester = Hailo8Tester()
+            
+            self.logger.info(f"项目集成器初始化完成: {self.config.project_name}")
+            
+        except Exception as e:
+            self.logger.error(f"项目集成器初始化失败: {e}")
+            raise
+    
+    def integrate_with_project(self) -> bool:
+        """与项目集成"""
+        self.logger.info(f"开始与项目集成: {self.config.project_name}")
+        
+        try:
+            # 1. 创建项目目录结构（后续步骤依赖这些目录）
+            if not self._setup_project_structure():
+                return False
+            
+            # 2-4. 并行生成配置文件、集成脚本和文档（写入互不相关的文件）
+            generation_steps = (
+                self._generate_config_files,
+                self._create_integration_scripts,
+                self._generate_documentation
+            )
+            with ThreadPoolExecutor(max_workers=len(generation_steps)) as executor:
+                futures = [executor.submit(step) for step in generation_steps]
+                results = [future.result() for future in as_completed(futures)]
+            
+            if not all(results):
+                return False
+            
+            # 5. 自动安装（如果启用）
+            if self.config.auto_install:
+                self.logger.info("开始自动安装Hailo8...")
+                try:
+                    installed = self.installer is not None and self.installer.install_all()
+                except Exception as e:
+                    self.logger.error(f"自动安装异常: {e}")
+                    installed = False
+                
+                if installed:
                     self.logger.info("Hailo8自动安装成功")
                 else:
-                    self.logger.error("Hailo8自动安装失败")
-                return success
-            else:
-                self.logger.error("安装器未初始化")
+                    self.logger.warning("自动安装失败，但集成继续")
+            
+            self.logger.info("项目集成完成")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"项目集成失败: {e}")
+            return False
+    
+    def _setup_project_structure(self) -> bool:
+        """设置项目目录结构"""
+        try:
+            # 创建必要目录（hailo8 根目录最先创建）
+            hailo_root = str(self._hailo_root)
+            for directory in ('', 'config', 'scripts', 'logs', 'docker', 'tests'):
+                dir_path = os.path.join(hailo_root, directory)
+                os.makedirs(dir_path, exist_ok=True)
+                self.logger.debug("创建目录: %s", dir_path)
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"设置项目结构失败: {e}")
+            return False
+    
+    def _generate_config_files(self) -> bool:
+        """生成配置文件"""
+        try:
+            config_dir = self._config_dir
+            
+            # 生成主配置文件
+            main_config = {
+                'project': {
+                    'name': self.config.project_name,
+                    'hailo8_enabled': self.config.hailo8_enabled,
+                    'docker_enabled': self.config.docker_enabled
+                },
+                'hailo8': {
+                    'install_dir': str(self._hailo_root),
+                    'auto_install': self.config.auto_install,
+                    'log_level': self.config.log_level
+                },
+                'docker': {
+                    'enabled': self.config.docker_enabled,
+                    'image_name': f"{self.config.project_name.lower()}-hailo8",
+                    'container_name': f"{self.config.project_name.lower()}-hailo8-container"
+                },
+                'custom': self.config.custom_settings
+            }
+            
+            # 保存为YAML格式
+            config_file = config_dir / 'hailo8_integration.yaml'
+            config_yaml = yaml.dump(
+                main_config, Dumper=_Dumper, default_flow_style=False, allow_unicode=True
+            )
+            self._write_atomic(config_file, config_yaml.encode('utf-8'))
+            
+            self.logger.info(f"配置文件已生成: {config_file}")
+            
+            # 生成环境变量文件
+            env_file = config_dir / 'hailo8.env'
+            self._write_atomic(env_file, (
+                f"# Hailo8 环境变量配置\n"
+                f"PROJECT_NAME={self.config.project_name}\n"
+                f"HAILO8_ENABLED={self.config.hailo8_enabled}\n"
+                f"DOCKER_ENABLED={self.config.docker_enabled}\n"
+                f"HAILO8_INSTALL_DIR={self._hailo_root}\n"
+                f"LOG_LEVEL={self.config.log_level}\n"
+            ).encode('utf-8'))
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"生成配置文件失败: {e}")
+            return False
+    
+    def _create_integration_scripts(self) -> bool:
+        """创建集成脚本"""
+        try:
+            scripts_dir = self._scripts_dir
+            
+            # 创建安装脚本
+            install_script = scripts_dir / 'install_hailo8.py'
+            self._write_atomic(install_script, self._generate_install_script().encode('utf-8'))
+            
+            # 创建测试脚本
+            test_script = scripts_dir / 'test_hailo8.py'
+            self._write_atomic(test_script, self._generate_test_script().encode('utf-8'))
+            
+            # 创建Docker脚本
+            if self.config.docker_enabled:
+                docker_script = scripts_dir / 'docker_hailo8.py'
+                self._write_atomic(docker_script, self._generate_docker_script().encode('utf-8'))
+            
+            # 创建启动脚本
+            startup_script = scripts_dir / 'startup.sh'
+            self._write_atomic(
+                startup_script, self._generate_startup_script().encode('utf-8'), mode=0o755
+            )
+            
+            self.logger.info("集成脚本已创建")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"创建集成脚本失败: {e}")
+            return False
+    
+    def _write_atomic(self, path: Path, data: bytes, mode: Optional[int] = None) -> bool:
+        """原子写入文件，内容未变化时跳过，返回是否写入
+        
+        未指定 mode 时新文件权限由内核按当前 umask 决定（与 open() 创建一致）
+        """
+        try:
+            if path.read_bytes() == data:
+                if mode is not None and stat.S_IMODE(path.stat().st_mode) != mode:
+                    os.chmod(path, mode)
+                self.logger.debug("文件未变化，跳过写入: %s", path)
                 return False
-                
+        except FileNotFoundError:
+            pass
+        
+        # 先写入同目录临时文件，再替换目标文件
+        tmp = path.parent / f".{path.name}.{os.urandom(6).hex()}"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if mode is not None:
+                os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return True
+    
+    def _template_values(self) -> Dict[str, Any]:
+        """生成模板填充参数"""
+        return {
+            'project_name': self.config.project_name,
+            'project_slug': self.config.project_name.lower(),
+            'log_level': self.config.log_level,
+            'hailo8_enabled': self._YAML_BOOL[self.config.hailo8_enabled],
+            'docker_enabled': self._YAML_BOOL[self.config.docker_enabled],
+            'auto_install': self._YAML_BOOL[self.config.auto_install]
+        }
+    
+    def _generate_install_script(self) -> str:
+        """生成安装脚本内容"""
+        return _INSTALL_SCRIPT_TEMPLATE.format_map(self._template_values())
+    
+    def _generate_test_script(self) -> str:
+        """生成测试脚本内容"""
+        return _TEST_SCRIPT_TEMPLATE.format_map(self._template_values())
+    
+    def _generate_docker_script(self) -> str:
+        """生成Docker脚本内容"""
+        return _DOCKER_SCRIPT_TEMPLATE.format_map(self._template_values())
+    
+    def _generate_startup_script(self) -> str:
+        """生成启动脚本内容"""
+        return _STARTUP_SCRIPT_TEMPLATE.format_map(self._template_values())
+    
+    def _generate_documentation(self) -> bool:
+        """生成文档"""
+        try:
+            # 生成集成说明文档
+            readme_content = self._generate_integration_readme()
+            readme_file = self._hailo_root / 'README.md'
+            self._write_atomic(readme_file, readme_content.encode('utf-8'))
+            
+            # 生成API文档
+            api_doc_content = self._generate_api_documentation()
+            api_doc_file = self._hailo_root / 'API.md'
+            self._write_atomic(api_doc_file, api_doc_content.encode('utf-8'))
+            
+            self.logger.info("文档已生成")
+            return True
+            
         except Exception as e:
-            self.logger.error(f"自动安装异常: {e}")
+            self.logger.error(f"生成文档失败: {e}")
             return False
     
+    def _generate_integration_readme(self) -> str:
+        """生成集成说明文档"""
+        return _INTEGRATION_README_TEMPLATE.format_map(self._template_values())
+    
+    def _generate_api_documentation(self) -> str:
+        """生成API文档"""
+        return _API_DOCUMENTATION_TEMPLATE.format_map(self._template_values())
+    
     def get_integration_status(self) -> Dict[str, Any]:
         """获取集成状态"""
         status = {
@@ -857,17 +903,21 @@ success = installer.install()
     def export_integration_config(self, output_file: str) -> bool:
         """导出集成配置"""
         try:
-            config_data = {
-                'integration_config': asdict(self.config),
-                'system_info': get_system_info(),
-                'status': self.get_integration_status()
-            }
+            status = self.get_integration_status()
+            sections = (
+                ('integration_config', asdict(self.config)),
+                ('system_info', status['system_info']),
+                ('status', status)
+            )
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 if output_file.endswith('.json'):
-                    json.dump(config_data, f, indent=2, ensure_ascii=False)
+                    json.dump(dict(sections), f, indent=2, ensure_ascii=False)
                 else:
-                    yaml.dump(config_data, f, default_flow_style=False, allow_unicode=True)
+                    # 逐段写入同一个YAML映射，不再组装完整的导出字典
+                    for key, value in sections:
+                        yaml.dump({key: value}, f, Dumper=_Dumper,
+                                  default_flow_style=False, allow_unicode=True)
             
             self.logger.info(f"集成配置已导出: {output_file}")
             return True
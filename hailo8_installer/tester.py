@@ -6,46 +6,316 @@ Hailo8 安装验证测试脚本
 
 import os
 import sys
+import shutil
+import asyncio
+import json
+import select
 import subprocess
 import time
 import logging
+import logging.config
+import logging.handlers
+import atexit
+import queue
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+try:
+    from . import _hailo_probe
+    from .utils import _service_cgroup_has_procs
+except ImportError:
+    # 直接以脚本运行 tester.py 时
+    import _hailo_probe  # type: ignore[no-redef]
+    from utils import _service_cgroup_has_procs  # type: ignore[no-redef]
+
+# 常驻 HailoRT 探测进程运行的文件（测试进程无法导入 hailo_platform 时使用）
+_PROBE_WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_hailo_probe.py')
+
+# 探测进程启动代码：按文件路径以模块方式加载 _hailo_probe，
+# 可直接使用 pip 安装时生成的 __pycache__，也不会把包目录加入 sys.path
+_PROBE_WORKER_BOOTSTRAP = (
+    "import sys, importlib.util\n"
+    "spec = importlib.util.spec_from_file_location('_hailo_probe', sys.argv[1])\n"
+    "module = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(module)\n"
+    "module.main()\n"
+)
+
+def _run_command(command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
+    """执行命令"""
+    try:
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False
+        )
+        return result.returncode == 0, result.stdout, result.stderr
+    except subprocess.TimeoutExpired:
+        return False, "", "命令执行超时"
+    except Exception as e:
+        return False, "", str(e)
+
+def _indent_lines(text: str, prefix: str = "  ") -> str:
+    """把命令输出的非空行加上缩进，拼成一条多行日志"""
+    return '\n'.join(prefix + line for line in text.strip().split('\n') if line.strip())
+
+@functools.lru_cache(maxsize=1)
+def _read_os_release() -> str:
+    """读取 /etc/os-release 内容"""
+    with open('/etc/os-release', 'r') as f:
+        return f.read()
+
+# 测试日志文件的后台写入线程（进程内只创建一次）
+_file_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _file_log_handler() -> logging.Handler:
+    """返回写入 hailo8_test.log 的队列处理器，实际写盘在后台线程完成"""
+    global _file_log_listener
+    if _file_log_listener is None:
+        _file_log_listener = logging.handlers.QueueListener(
+            queue.Queue(-1), logging.FileHandler('hailo8_test.log'), respect_handler_level=True
+        )
+        _file_log_listener.start()
+        atexit.register(_file_log_listener.stop)
+    return logging.handlers.QueueHandler(_file_log_listener.queue)
+
+# 测试日志只配置一次，多次创建 Hailo8Tester 不会重复添加处理器
+_CONFIGURED = False
+
+class _ThreadLogBuffer(logging.Filter):
+    """暂存指定线程的日志记录，测试结束后再整体输出，避免并发测试的日志交错"""
+    
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+    
+    def start(self, records: List[logging.LogRecord]):
+        """当前线程之后的日志记录追加到 records，不再直接输出"""
+        self._local.records = records
+    
+    def stop(self):
+        """恢复当前线程的日志直接输出"""
+        self._local.records = None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        records = getattr(self._local, 'records', None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
 class Hailo8Tester:
     """Hailo8 测试类"""
     
     def __init__(self):
         self.setup_logging()
-        self.test_results = {}
+        
+        # 测试名称与结果分两个列表按顺序存放
+        self._names: List[str] = []
+        self._passed: List[bool] = []
+        
+        # 进程内 hailo_platform 模块（首次使用时导入）
+        self._hp = None
+        self._hp_checked = False
+        
+        # HailoRT 探测进程（进程内无法导入 hailo_platform 时才启动）
+        self._py = None
+        self._probe_lock = threading.Lock()
+        
+        # 进程内压力测试线程池（首次使用时创建，重复测试时复用）
+        self._stress_pool = None
+        
+        # 一次 run_all_tests 内的命令结果缓存（None 表示不缓存）
+        self._cmd_cache: Optional[Dict[Tuple[str, ...], Tuple[bool, str, str]]] = None
         
     def setup_logging(self):
         """设置日志"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(),
-                logging.FileHandler('hailo8_test.log')
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        global _CONFIGURED
+        if not _CONFIGURED:
+            logging.config.dictConfig({
+                'version': 1,
+                'disable_existing_loggers': False,
+                'formatters': {
+                    'default': {'format': '%(asctime)s - %(levelname)s - %(message)s'},
+                },
+                'handlers': {
+                    'stream': {'class': 'logging.StreamHandler', 'formatter': 'default'},
+                    'file': {'()': _file_log_handler, 'formatter': 'default'},
+                },
+                'loggers': {
+                    'hailo8_tester': {
+                        'handlers': ['stream', 'file'],
+                        'level': 'INFO',
+                        'propagate': False,
+                    },
+                },
+            })
+            _CONFIGURED = True
+        self.logger = logging.getLogger('hailo8_tester')
     
     def run_command(self, command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
         """执行命令"""
+        return _run_command(command, timeout)
+    
+    def _cached_cmd(self, command: Tuple[str, ...]) -> Tuple[bool, str, str]:
+        """执行 lsmod/lspci/uname 等在一次完整测试中不变的查询，run_all_tests 期间缓存结果"""
+        cache = self._cmd_cache
+        if cache is None:
+            return _run_command(list(command))
+        if command not in cache:
+            cache[command] = _run_command(list(command))
+        return cache[command]
+    
+    @property
+    def test_results(self) -> Dict[str, bool]:
+        """最近一次 run_all_tests 的结果（测试名称 -> 是否通过）"""
+        return dict(zip(self._names, self._passed))
+    
+    def _load_hailo_platform(self):
+        """尝试在测试进程内导入 hailo_platform，结果缓存在 self._hp 上"""
+        if not self._hp_checked:
+            self._hp_checked = True
+            try:
+                import hailo_platform
+            except ImportError:
+                return None
+            self._hp = hailo_platform
+        
+        return self._hp
+    
+    def _probe(self, op: str, timeout: int = 30) -> Tuple[bool, str, str]:
+        """执行 HailoRT 探测操作，返回值与 run_command 一致
+        
+        能在进程内导入 hailo_platform 时直接调用，否则交给常驻探测进程
+        """
+        with self._probe_lock:
+            hailo_platform = self._load_hailo_platform()
+        
+        if hailo_platform is not None:
+            return self._run_in_process(lambda: _hailo_probe.OPS[op](hailo_platform), timeout)
+        
+        with self._probe_lock:
+            try:
+                if self._py is None or self._py.poll() is not None:
+                    self._py = subprocess.Popen(
+                        ['python3', '-u', '-c', _PROBE_WORKER_BOOTSTRAP, _PROBE_WORKER_PATH],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        text=True
+                    )
+                
+                self._py.stdin.write(json.dumps({'op': op}) + '\n')
+                self._py.stdin.flush()
+                
+                ready, _, _ = select.select([self._py.stdout], [], [], timeout)
+                if not ready:
+                    self._stop_probe_worker()
+                    return False, "", "命令执行超时"
+                
+                line = self._py.stdout.readline()
+                if not line:
+                    self._stop_probe_worker()
+                    return False, "", "探测进程意外退出"
+                
+                response = json.loads(line)
+                return response['ok'], response['stdout'], response['stderr']
+                
+            except Exception as e:
+                self._stop_probe_worker()
+                return False, "", str(e)
+    
+    def _run_in_process(self, op, timeout: int) -> Tuple[bool, str, str]:
+        """在守护线程中执行进程内探测操作，返回值与 _probe 一致
+        
+        超时的线程无法强制结束，但它是守护线程，不会阻止测试进程退出；
+        结果只包含探测操作返回的输出行，hailo_platform 自身的打印直接输出到控制台
+        """
+        outcome = []
+        
+        def target():
+            try:
+                outcome.append(op())
+            except Exception as e:
+                outcome.append(e)
+        
+        thread = threading.Thread(target=target, name='hailo8-probe', daemon=True)
+        thread.start()
+        thread.join(timeout)
+        
+        if not outcome:
+            return False, "", "命令执行超时"
+        if isinstance(outcome[0], Exception):
+            return False, "", str(outcome[0])
+        
+        ok, lines = outcome[0]
+        return bool(ok), _hailo_probe.format_output(lines), ""
+    
+    def _stop_probe_worker(self):
+        """停止探测进程"""
+        if self._py is None:
+            return
+        
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False
+            self._py.kill()
+            self._py.wait()
+        except Exception:
+            pass
+        self._py = None
+    
+    def _stress_in_process(self, timeout: int = 60) -> Tuple[bool, str, str]:
+        """在进程内并发执行 5 次设备扫描，返回值与 _probe('stress') 一致"""
+        if self._stress_pool is None:
+            self._stress_pool = ThreadPoolExecutor(max_workers=5)
+        
+        return self._run_in_process(
+            functools.partial(_hailo_probe.op_stress, self._hp, executor=self._stress_pool), timeout
+        )
+    
+    def _stress_hailortcli(self, timeout: int = 60) -> Tuple[bool, str, str]:
+        """用 5 个并发的 hailortcli scan 子进程做压力测试，返回值与 _probe('stress') 一致"""
+        async def probe() -> bool:
+            process = await asyncio.create_subprocess_exec(
+                'hailortcli', 'scan',
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
             )
-            return result.returncode == 0, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            return False, "", "命令执行超时"
-        except Exception as e:
-            return False, "", str(e)
+            try:
+                return await asyncio.wait_for(process.wait(), timeout) == 0
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return False
+        
+        async def run_all():
+            return await asyncio.gather(*[probe() for _ in range(5)], return_exceptions=True)
+        
+        results = asyncio.run(run_all())
+        success_count = sum(1 for result in results if result is True)
+        
+        stdout = f"压力测试结果: {success_count}/5 成功\n"
+        if success_count >= 4:
+            return True, stdout + "压力测试通过\n", ""
+        return False, stdout + "压力测试失败\n", ""
+    
+    def close(self):
+        """释放测试器持有的资源"""
+        with self._probe_lock:
+            self._stop_probe_worker()
+        if self._stress_pool is not None:
+            self._stress_pool.shutdown(wait=False)
+            self._stress_pool = None
+    
+    def __del__(self):
+        try:
+            self._stop_probe_worker()
+        except Exception:
+            pass
     
     def test_system_info(self) -> bool:
         """测试系统信息"""
@@ -53,17 +323,16 @@ class Hailo8Tester:
         
         try:
             # 操作系统信息
-            with open('/etc/os-release', 'r') as f:
-                os_info = f.read()
+            os_info = _read_os_release()
             self.logger.info(f"操作系统信息:\n{os_info}")
             
             # 内核版本
-            success, stdout, _ = self.run_command(['uname', '-r'])
+            success, stdout, _ = self._cached_cmd(('uname', '-r'))
             if success:
                 self.logger.info(f"内核版本: {stdout.strip()}")
             
             # 系统架构
-            success, stdout, _ = self.run_command(['uname', '-m'])
+            success, stdout, _ = self._cached_cmd(('uname', '-m'))
             if success:
                 self.logger.info(f"系统架构: {stdout.strip()}")
             
@@ -78,31 +347,41 @@ class Hailo8Tester:
         self.logger.info("=== 驱动状态测试 ===")
         
         try:
+            # lsmod 与 lspci 互不依赖，并发执行
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                f_lsmod = executor.submit(self._cached_cmd, ('lsmod',))
+                f_lspci = executor.submit(self._cached_cmd, ('lspci', '-d', '1e60:'))
+                lsmod_result = f_lsmod.result()
+                lspci_result = f_lspci.result()
+            
             # 检查模块是否加载
-            success, stdout, _ = self.run_command(['lsmod'])
+            success, stdout, _ = lsmod_result
             if success:
                 if 'hailo' in stdout.lower():
-                    self.logger.info("✓ Hailo 驱动模块已加载")
-                    
                     # 显示模块详细信息
-                    lines = stdout.split('\n')
-                    for line in lines:
-                        if 'hailo' in line.lower():
-                            self.logger.info(f"  模块信息: {line}")
+                    modules = '\n'.join(
+                        f"  模块信息: {line}" for line in stdout.split('\n') if 'hailo' in line.lower()
+                    )
+                    self.logger.info(f"✓ Hailo 驱动模块已加载\n{modules}")
                 else:
                     self.logger.error("✗ Hailo 驱动模块未加载")
                     return False
             
             # 检查设备节点
-            device_nodes = ['/dev/hailo0', '/dev/hailo_pci']
+            device_nodes = ['hailo0', 'hailo_pci']
             found_device = False
             
-            for node in device_nodes:
-                if os.path.exists(node):
-                    self.logger.info(f"✓ 设备节点存在: {node}")
+            # 只扫描一次 /dev，避免逐个节点 stat
+            with os.scandir('/dev') as it:
+                dev_entries = {entry.name: entry for entry in it if entry.name in device_nodes}
+            
+            for name in device_nodes:
+                entry = dev_entries.get(name)
+                if entry is not None:
+                    self.logger.info(f"✓ 设备节点存在: {entry.path}")
                     
                     # 检查设备权限
-                    stat_info = os.stat(node)
+                    stat_info = entry.stat()
                     self.logger.info(f"  权限: {oct(stat_info.st_mode)[-3:]}")
                     found_device = True
             
@@ -111,11 +390,9 @@ class Hailo8Tester:
                 return False
             
             # 检查 PCIe 设备
-            success, stdout, _ = self.run_command(['lspci', '-d', '1e60:'])
+            success, stdout, _ = lspci_result
             if success and stdout.strip():
-                self.logger.info("✓ 检测到 Hailo PCIe 设备:")
-                for line in stdout.strip().split('\n'):
-                    self.logger.info(f"  {line}")
+                self.logger.info(f"✓ 检测到 Hailo PCIe 设备:\n{_indent_lines(stdout)}")
             else:
                 self.logger.warning("⚠ 未检测到 Hailo PCIe 设备")
             
@@ -143,10 +420,7 @@ class Hailo8Tester:
                 self.logger.warning("⚠ HailoRT CLI 工具未找到")
             
             # 检查 Python 模块
-            success, stdout, stderr = self.run_command([
-                'python3', '-c', 
-                'import hailo_platform; print(f"HailoRT Python 版本: {hailo_platform.__version__}")'
-            ])
+            success, stdout, stderr = self._probe('version')
             
             if success:
                 self.logger.info(f"✓ {stdout.strip()}")
@@ -155,25 +429,10 @@ class Hailo8Tester:
                 return False
             
             # 测试基本功能
-            success, stdout, stderr = self.run_command([
-                'python3', '-c', '''
-import hailo_platform
-try:
-    # 尝试获取设备信息
-    devices = hailo_platform.Device.scan()
-    print(f"检测到 {len(devices)} 个 Hailo 设备")
-    for i, device in enumerate(devices):
-        print(f"设备 {i}: {device}")
-except Exception as e:
-    print(f"设备扫描失败: {e}")
-'''
-            ])
+            success, stdout, stderr = self._probe('scan')
             
             if success:
-                self.logger.info(f"✓ HailoRT 功能测试:")
-                for line in stdout.strip().split('\n'):
-                    if line.strip():
-                        self.logger.info(f"  {line}")
+                self.logger.info(f"✓ HailoRT 功能测试:\n{_indent_lines(stdout)}")
             else:
                 self.logger.error(f"✗ HailoRT 功能测试失败: {stderr}")
                 return False
@@ -198,8 +457,11 @@ except Exception as e:
             self.logger.info("✓ Docker 已安装")
             
             # 检查 Docker 服务状态
-            success, stdout, _ = self.run_command(['systemctl', 'is-active', 'docker'])
-            if success and 'active' in stdout:
+            docker_active = _service_cgroup_has_procs('docker')
+            if not docker_active:
+                success, stdout, _ = self.run_command(['systemctl', 'is-active', 'docker'])
+                docker_active = success and 'active' in stdout
+            if docker_active:
                 self.logger.info("✓ Docker 服务运行中")
             else:
                 self.logger.error("✗ Docker 服务未运行")
@@ -237,39 +499,10 @@ except Exception as e:
         
         try:
             # 简单的性能测试
-            success, stdout, stderr = self.run_command([
-                'python3', '-c', '''
-import hailo_platform
-import time
-
-try:
-    devices = hailo_platform.Device.scan()
-    if not devices:
-        print("未找到 Hailo 设备")
-        exit(1)
-    
-    device = devices[0]
-    print(f"使用设备: {device}")
-    
-    # 测试设备初始化时间
-    start_time = time.time()
-    # 这里可以添加更多的性能测试代码
-    end_time = time.time()
-    
-    print(f"设备初始化时间: {end_time - start_time:.3f} 秒")
-    print("基本性能测试完成")
-    
-except Exception as e:
-    print(f"性能测试失败: {e}")
-    exit(1)
-'''
-            ], timeout=120)
+            success, stdout, stderr = self._probe('benchmark', timeout=120)
             
             if success:
-                self.logger.info("✓ 性能基准测试:")
-                for line in stdout.strip().split('\n'):
-                    if line.strip():
-                        self.logger.info(f"  {line}")
+                self.logger.info(f"✓ 性能基准测试:\n{_indent_lines(stdout)}")
             else:
                 self.logger.error(f"✗ 性能基准测试失败: {stderr}")
                 return False
@@ -285,53 +518,20 @@ except Exception as e:
         self.logger.info("=== 压力测试 ===")
         
         try:
-            # 简单的压力测试
-            success, stdout, stderr = self.run_command([
-                'python3', '-c', '''
-import hailo_platform
-import time
-import threading
-
-def device_test():
-    try:
-        devices = hailo_platform.Device.scan()
-        if devices:
-            device = devices[0]
-            # 这里可以添加设备操作
-            time.sleep(1)
-            return True
-    except:
-        return False
-    return False
-
-# 运行多线程测试
-threads = []
-results = []
-
-for i in range(5):
-    thread = threading.Thread(target=lambda: results.append(device_test()))
-    threads.append(thread)
-    thread.start()
-
-for thread in threads:
-    thread.join()
-
-success_count = sum(results)
-print(f"压力测试结果: {success_count}/5 成功")
-
-if success_count >= 4:
-    print("压力测试通过")
-else:
-    print("压力测试失败")
-    exit(1)
-'''
-            ], timeout=60)
+            # 简单的压力测试：优先在进程内执行，其次并发运行 hailortcli，最后才用探测进程
+            with self._probe_lock:
+                hailo_platform = self._load_hailo_platform()
+            
+            if hailo_platform is not None:
+                success, stdout, stderr = self._stress_in_process(timeout=60)
+            elif sys.version_info >= (3, 8) and shutil.which('hailortcli'):
+                # 3.8 起 asyncio 才能在非主线程（并发测试的工作线程）中创建子进程
+                success, stdout, stderr = self._stress_hailortcli(timeout=60)
+            else:
+                success, stdout, stderr = self._probe('stress', timeout=60)
             
             if success:
-                self.logger.info("✓ 压力测试:")
-                for line in stdout.strip().split('\n'):
-                    if line.strip():
-                        self.logger.info(f"  {line}")
+                self.logger.info(f"✓ 压力测试:\n{_indent_lines(stdout)}")
             else:
                 self.logger.error(f"✗ 压力测试失败: {stderr}")
                 return False
@@ -346,6 +546,9 @@ else:
         """运行所有测试"""
         self.logger.info("开始 Hailo8 完整测试...")
         
+        # 每次完整测试重新查询一次系统状态，本次运行的测试之间共享结果
+        self._cmd_cache = {}
+        
         tests = [
             ("系统信息", self.test_system_info),
             ("驱动状态", self.test_driver_status),
@@ -355,58 +558,97 @@ else:
             ("压力测试", self.test_stress_test)
         ]
         
-        results = {}
-        passed = 0
+        # 按原始顺序预置结果，保证报告顺序稳定
+        names = [test_name for test_name, _ in tests]
+        passed = [False] * len(tests)
         total = len(tests)
         
-        for test_name, test_func in tests:
-            self.logger.info(f"\n开始测试: {test_name}")
+        # 各测试相互独立，主要耗时在等待子进程，并行执行；
+        # 每个测试的日志先暂存，测试结束后连同开始标题一起输出
+        log_buffer = _ThreadLogBuffer()
+        buffered: List[List[logging.LogRecord]] = [[] for _ in tests]
+        
+        def run_test(index: int, test_name: str, test_func) -> bool:
+            log_buffer.start(buffered[index])
             try:
-                result = test_func()
-                results[test_name] = result
-                if result:
-                    passed += 1
-                    self.logger.info(f"✅ {test_name} - 通过")
-                else:
-                    self.logger.error(f"❌ {test_name} - 失败")
-            except Exception as e:
-                results[test_name] = False
-                self.logger.error(f"❌ {test_name} - 异常: {e}")
+                self.logger.info(f"\n开始测试: {test_name}")
+                return test_func()
+            finally:
+                log_buffer.stop()
+        
+        self.logger.addFilter(log_buffer)
+        try:
+            with ThreadPoolExecutor(max_workers=total) as executor:
+                futures = {
+                    executor.submit(run_test, index, test_name, test_func): index
+                    for index, (test_name, test_func) in enumerate(tests)
+                }
+                
+                for future in as_completed(futures):
+                    index = futures[future]
+                    test_name = names[index]
+                    for record in buffered[index]:
+                        self.logger.handle(record)
+                    try:
+                        result = future.result()
+                        if result:
+                            self.logger.info(f"✅ {test_name} - 通过")
+                        else:
+                            self.logger.error(f"❌ {test_name} - 失败")
+                    except Exception as e:
+                        result = False
+                        self.logger.error(f"❌ {test_name} - 异常: {e}")
+                    
+                    passed[index] = bool(result)
+        finally:
+            self.logger.removeFilter(log_buffer)
+        
+        # 单独调用的测试不沿用本次运行的缓存
+        self._cmd_cache = None
+        self._names, self._passed = names, passed
+        passed_count = sum(passed)
         
         # 输出测试总结
         self.logger.info(f"\n=== 测试总结 ===")
         self.logger.info(f"总测试数: {total}")
-        self.logger.info(f"通过测试: {passed}")
-        self.logger.info(f"失败测试: {total - passed}")
-        self.logger.info(f"成功率: {passed/total*100:.1f}%")
+        self.logger.info(f"通过测试: {passed_count}")
+        self.logger.info(f"失败测试: {total - passed_count}")
+        self.logger.info(f"成功率: {passed_count/total*100:.1f}%")
         
-        if passed == total:
+        if passed_count == total:
             self.logger.info("🎉 所有测试通过！Hailo8 安装成功！")
         else:
             self.logger.error("⚠️  部分测试失败，请检查安装")
         
-        return results
+        return self.test_results
     
-    def generate_report(self, results: Dict[str, bool]):
-        """生成测试报告"""
+    def generate_report(self, results: Optional[Dict[str, bool]] = None):
+        """生成测试报告（未传入结果时使用最近一次 run_all_tests 的结果）"""
         report_file = "hailo8_test_report.txt"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("Hailo8 安装验证报告\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"测试时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            f.write("测试结果:\n")
-            for test_name, result in results.items():
-                status = "✅ 通过" if result else "❌ 失败"
-                f.write(f"  {test_name}: {status}\n")
-            
-            f.write(f"\n总体结果: {sum(results.values())}/{len(results)} 通过\n")
-            
-            if all(results.values()):
-                f.write("\n🎉 Hailo8 安装验证成功！\n")
-            else:
-                f.write("\n⚠️  部分测试失败，建议重新安装或检查配置\n")
+        if results is None:
+            names, passed = self._names, self._passed
+        else:
+            names, passed = list(results), [bool(result) for result in results.values()]
+        
+        rows = "\n".join(f"  {name}: {'✅ 通过' if ok else '❌ 失败'}" for name, ok in zip(names, passed))
+        if all(passed):
+            conclusion = "🎉 Hailo8 安装验证成功！"
+        else:
+            conclusion = "⚠️  部分测试失败，建议重新安装或检查配置"
+        
+        report = (
+            "Hailo8 安装验证报告\n"
+            + "=" * 50 + "\n\n"
+            + f"测试时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            + "测试结果:\n"
+            + (rows + "\n" if rows else "")
+            + f"\n总体结果: {sum(passed)}/{len(passed)} 通过\n"
+            + f"\n{conclusion}\n"
+        )
+        
+        with open(report_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(report)
         
         self.logger.info(f"测试报告已保存到: {report_file}")
 
@@ -8,43 +8,81 @@ import os
 import sys
 import subprocess
 import logging
+import logging.handlers
+import atexit
+import queue
 import platform
 import shutil
 import tempfile
 import time
+import random
+import functools
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from enum import Enum
 
+@functools.lru_cache(maxsize=1)
+def _read_distro_info() -> Dict[str, str]:
+    """解析 /etc/os-release（进程内只读取一次）"""
+    info = {}
+    
+    try:
+        if os.path.exists('/etc/os-release'):
+            with open('/etc/os-release', 'r') as f:
+                for line in f:
+                    if '=' in line:
+                        key, value = line.strip().split('=', 1)
+                        info[key] = value.strip('"')
+    except Exception:
+        pass
+    
+    return info
+
+def _read_proc(path: str) -> bytes:
+    """以字节形式读取 procfs 文件（不经过文本解码与缓冲层）"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+@functools.lru_cache(maxsize=1)
+def _read_cpuinfo() -> bytes:
+    """读取 /proc/cpuinfo（进程内只读取一次）"""
+    return _read_proc('/proc/cpuinfo')
+
+# 运行期间不会变化的平台信息，模块导入时读取一次
+_UNAME = platform.uname()
+_PYTHON_VERSION = platform.python_version()
+
+@functools.lru_cache(maxsize=None)
+def get_distro_name() -> str:
+    """获取发行版名称"""
+    return _read_distro_info().get('ID', 'unknown').lower()
+
 class SystemInfo:
     """系统信息类"""
     
     def __init__(self):
-        self.os_name = platform.system()
-        self.os_version = platform.release()
-        self.architecture = platform.machine()
-        self.python_version = platform.python_version()
+        self.os_name = _UNAME.system
+        self.os_version = _UNAME.release
+        self.architecture = _UNAME.machine
+        self.python_version = _PYTHON_VERSION
         self.distro_info = self._get_distro_info()
     
     def _get_distro_info(self) -> Dict[str, str]:
         """获取Linux发行版信息"""
-        info = {}
-        
-        try:
-            if os.path.exists('/etc/os-release'):
-                with open('/etc/os-release', 'r') as f:
-                    for line in f:
-                        if '=' in line:
-                            key, value = line.strip().split('=', 1)
-                            info[key] = value.strip('"')
-        except Exception:
-            pass
-        
-        return info
+        return dict(_read_distro_info())
     
     def get_distro_name(self) -> str:
         """获取发行版名称"""
-        return self.distro_info.get('ID', 'unknown').lower()
+        return get_distro_name()
     
     def get_distro_version(self) -> str:
         """获取发行版版本"""
@@ -55,6 +93,34 @@ class SystemInfo:
         supported = ['ubuntu', 'debian', 'centos', 'rhel', 'fedora']
         return self.get_distro_name() in supported
 
+# 文件日志的后台写入线程（setup_logging 重复调用时替换）
+_file_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_file_log_listener():
+    """停止文件日志后台线程并刷新剩余记录"""
+    global _file_log_listener
+    if _file_log_listener is not None:
+        _file_log_listener.stop()
+        for handler in _file_log_listener.handlers:
+            handler.close()
+        _file_log_listener = None
+
+atexit.register(_stop_file_log_listener)
+
+# 已配置的 logger 及其参数，参数不变时 setup_logging 直接返回
+_LOGGER: Optional[logging.Logger] = None
+_LOGGER_ARGS: Optional[Tuple] = None
+
+# 按格式字符串复用 Formatter 对象
+_FORMATTERS: Dict[str, logging.Formatter] = {}
+
+def _get_formatter(format_string: str) -> logging.Formatter:
+    """获取（并缓存）指定格式的 Formatter"""
+    formatter = _FORMATTERS.get(format_string)
+    if formatter is None:
+        formatter = _FORMATTERS[format_string] = logging.Formatter(format_string)
+    return formatter
+
 def setup_logging(
     level: str = "INFO",
     log_file: Optional[str] = None,
@@ -74,6 +140,13 @@ def setup_logging(
         配置好的logger对象
     """
     
+    global _LOGGER, _LOGGER_ARGS, _file_log_listener
+    
+    # 参数未变化且处理器仍在时不重建处理器
+    args = (level, log_file, colored, format_string)
+    if _LOGGER is not None and _LOGGER_ARGS == args and _LOGGER.handlers:
+        return _LOGGER
+    
     # 设置日志级别
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     
@@ -94,22 +167,42 @@ def setup_logging(
     # 控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
-    console_formatter = logging.Formatter(format_string)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(_get_formatter(format_string))
     logger.addHandler(console_handler)
     
-    # 文件处理器
+    # 文件处理器：记录先入队，由后台线程写盘
+    _stop_file_log_listener()
     if log_file:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(numeric_level)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        file_handler.setFormatter(
+            _get_formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
+        
+        log_queue: queue.Queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(numeric_level)
+        logger.addHandler(queue_handler)
+        
+        _file_log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
         )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        _file_log_listener.start()
     
+    _LOGGER, _LOGGER_ARGS = logger, args
     return logger
 
+# 执行时间极短的命令：默认超时下直接 communicate()，不走超时计时逻辑
+_SHORT_COMMANDS = frozenset({'which', 'uname', 'lsmod'})
+
+def _is_short_command(command: List[str]) -> bool:
+    """判断是否为执行时间极短的命令"""
+    if not command:
+        return False
+    if command[0] in _SHORT_COMMANDS:
+        return True
+    return command[0] == 'systemctl' and len(command) > 1 and command[1] == 'is-active'
+
 def run_command(
     command: List[str],
     timeout: int = 300,
@@ -137,15 +230,31 @@ def run_command(
     logger.debug(f"执行命令: {' '.join(command)}")
     
     try:
-        result = subprocess.run(
-            command,
-            timeout=timeout,
-            cwd=cwd,
-            env=env,
-            capture_output=capture_output,
-            text=True,
-            check=check
-        )
+        if timeout >= 300 and _is_short_command(command):
+            # 短命令：无超时的 communicate() 直接阻塞等待子进程退出
+            pipe = subprocess.PIPE if capture_output else None
+            with subprocess.Popen(
+                command,
+                cwd=cwd,
+                env=env,
+                stdout=pipe,
+                stderr=pipe,
+                text=True
+            ) as process:
+                out, err = process.communicate()
+            result = subprocess.CompletedProcess(command, process.returncode, out, err)
+            if check:
+                result.check_returncode()
+        else:
+            result = subprocess.run(
+                command,
+                timeout=timeout,
+                cwd=cwd,
+                env=env,
+                capture_output=capture_output,
+                text=True,
+                check=check
+            )
         
         success = result.returncode == 0
         stdout = result.stdout if capture_output else ""
@@ -168,6 +277,9 @@ def run_command(
         logger.error(f"命令执行异常: {e}")
         return False, "", str(e)
 
+# 安装所需的最小可用磁盘空间（字节）
+MIN_FREE = 2 * 1024**3
+
 def check_system_requirements() -> Tuple[bool, List[str]]:
     """
     检查系统要求
@@ -180,12 +292,12 @@ def check_system_requirements() -> Tuple[bool, List[str]]:
     errors = []
     
     # 检查操作系统
-    if platform.system() != 'Linux':
-        errors.append(f"不支持的操作系统: {platform.system()}")
+    if _UNAME.system != 'Linux':
+        errors.append(f"不支持的操作系统: {_UNAME.system}")
     
     # 检查架构
-    if platform.machine() not in ['x86_64', 'amd64']:
-        errors.append(f"不支持的系统架构: {platform.machine()}")
+    if _UNAME.machine not in ['x86_64', 'amd64']:
+        errors.append(f"不支持的系统架构: {_UNAME.machine}")
     
     # 检查Python版本
     if sys.version_info < (3, 7):
@@ -197,11 +309,10 @@ def check_system_requirements() -> Tuple[bool, List[str]]:
     
     # 检查磁盘空间
     try:
-        statvfs = os.statvfs('/')
-        free_space_gb = (statvfs.f_frsize * statvfs.f_bavail) / (1024**3)
-        if free_space_gb < 2:
-            errors.append(f"磁盘空间不足: {free_space_gb:.1f}GB, 需要至少2GB")
-    except Exception as e:
+        free = shutil.disk_usage('/').free
+        if free < MIN_FREE:
+            errors.append(f"磁盘空间不足: {free / 1024**3:.1f}GB, 需要至少2GB")
+    except OSError as e:
         logger.warning(f"无法检查磁盘空间: {e}")
     
     # 检查发行版
@@ -240,6 +351,32 @@ def ensure_directory(path: str, mode: int = 0o755) -> bool:
         logger.error(f"创建目录失败: {path} - {e}")
         return False
 
+def _copy_file(src: str, dst: str):
+    """在内核中复制文件内容（copy_file_range/sendfile），不支持时回退到用户态复制，并保留元数据"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        remaining = os.fstat(src_fd).st_size
+        offset = 0
+        
+        try:
+            copy_range = getattr(os, 'copy_file_range', None)
+            while remaining > 0:
+                if copy_range is not None:
+                    copied = copy_range(src_fd, dst_fd, remaining)
+                else:
+                    copied = os.sendfile(dst_fd, src_fd, offset, remaining)
+                if copied == 0:
+                    break
+                offset += copied
+                remaining -= copied
+        except (AttributeError, OSError):
+            # 内核或文件系统不支持时，从已复制的位置继续在用户态复制
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            shutil.copyfileobj(fsrc, fdst)
+    
+    shutil.copystat(src, dst)
+
 def backup_file(file_path: str, backup_suffix: str = ".backup") -> Optional[str]:
     """
     备份文件
@@ -259,7 +396,7 @@ def backup_file(file_path: str, backup_suffix: str = ".backup") -> Optional[str]
     
     try:
         backup_path = f"{file_path}{backup_suffix}"
-        shutil.copy2(file_path, backup_path)
+        _copy_file(file_path, backup_path)
         logger.info(f"文件已备份: {file_path} -> {backup_path}")
         return backup_path
     except Exception as e:
@@ -285,7 +422,7 @@ def restore_file(backup_path: str) -> bool:
     
     try:
         original_path = backup_path.replace(".backup", "")
-        shutil.copy2(backup_path, original_path)
+        _copy_file(backup_path, original_path)
         logger.info(f"文件已恢复: {backup_path} -> {original_path}")
         return True
     except Exception as e:
@@ -367,6 +504,14 @@ def install_system_package(package: str, manager: Optional[str] = None) -> bool:
     
     return success
 
+def _service_cgroup_has_procs(service_name: str) -> bool:
+    """检查服务的 cgroup（cgroup v2）中是否有进程"""
+    try:
+        with open(f'/sys/fs/cgroup/system.slice/{service_name}.service/cgroup.procs', 'rb') as f:
+            return bool(f.read(1))
+    except OSError:
+        return False
+
 def check_service_status(service_name: str) -> bool:
     """
     检查系统服务状态
@@ -378,6 +523,10 @@ def check_service_status(service_name: str) -> bool:
         服务是否运行
     """
     
+    # 服务 cgroup 中有进程即视为运行中，无需启动 systemctl
+    if _service_cgroup_has_procs(service_name):
+        return True
+    
     success, stdout, _ = run_command(['systemctl', 'is-active', service_name])
     return success and 'active' in stdout
 
@@ -425,28 +574,33 @@ def enable_service(service_name: str) -> bool:
     
     return success
 
+# 重试等待时间上限（秒）
+RETRY_MAX_DELAY = 60.0
+
 def retry_operation(
-    operation,
     max_retries: int = 3,
     delay: float = 1.0,
     backoff_factor: float = 2.0,
     exceptions: Tuple = (Exception,)
 ):
     """
-    重试装饰器
+    重试装饰器，用法: @retry_operation(max_retries=3)
     
     Args:
-        operation: 要重试的操作
         max_retries: 最大重试次数
         delay: 初始延迟时间
         backoff_factor: 退避因子
         exceptions: 需要重试的异常类型
     
     Returns:
-        装饰后的函数
+        装饰器
     """
     
+    # 预先计算每次重试前的等待时间（不超过上限）
+    delays = [min(RETRY_MAX_DELAY, delay * backoff_factor ** i) for i in range(max_retries)]
+    
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             logger = logging.getLogger('hailo8_installer.utils')
             
@@ -458,55 +612,65 @@ def retry_operation(
                         logger.error(f"操作失败，已达到最大重试次数: {e}")
                         raise
                     
-                    wait_time = delay * (backoff_factor ** attempt)
+                    # ±10% 抖动，避免多个调用方同时重试
+                    wait_time = delays[attempt] * random.uniform(0.9, 1.1)
                     logger.warning(f"操作失败，{wait_time:.1f}秒后重试 (第{attempt + 1}次): {e}")
                     time.sleep(wait_time)
             
         return wrapper
     return decorator
 
-def get_system_info() -> Dict[str, Any]:
+def get_system_info(refresh: bool = False) -> Dict[str, Any]:
     """
-    获取详细的系统信息
+    获取详细的系统信息（静态字段在进程内缓存，内存信息每次重新读取）
+    
+    Args:
+        refresh: 是否丢弃缓存重新采集
     
     Returns:
         系统信息字典
     """
     
-    system_info = SystemInfo()
+    if refresh:
+        _collect_system_info.cache_clear()
     
-    info = {
-        'os_name': system_info.os_name,
-        'os_version': system_info.os_version,
-        'architecture': system_info.architecture,
-        'python_version': system_info.python_version,
-        'distro_name': system_info.get_distro_name(),
-        'distro_version': system_info.get_distro_version(),
-        'kernel_version': platform.release(),
-        'hostname': platform.node(),
-        'processor': platform.processor(),
-        'package_manager': get_package_manager(),
-    }
+    info = dict(_collect_system_info())
     
-    # 添加内存信息
+    # 添加内存信息（可用内存随时变化，不缓存）
     try:
-        with open('/proc/meminfo', 'r') as f:
-            meminfo = f.read()
-            for line in meminfo.split('\n'):
-                if line.startswith('MemTotal:'):
-                    info['memory_total'] = line.split()[1] + ' kB'
-                elif line.startswith('MemAvailable:'):
-                    info['memory_available'] = line.split()[1] + ' kB'
+        for line in _read_proc('/proc/meminfo').split(b'\n'):
+            if line.startswith(b'MemTotal:'):
+                info['memory_total'] = line.split()[1].decode() + ' kB'
+            elif line.startswith(b'MemAvailable:'):
+                info['memory_available'] = line.split()[1].decode() + ' kB'
     except Exception:
         pass
     
     # 添加CPU信息
     try:
-        with open('/proc/cpuinfo', 'r') as f:
-            cpuinfo = f.read()
-            cpu_count = cpuinfo.count('processor')
-            info['cpu_count'] = cpu_count
+        cpuinfo = _read_cpuinfo()
+        cpu_count = cpuinfo.count(b'\nprocessor\t') + (1 if cpuinfo.startswith(b'processor') else 0)
+        info['cpu_count'] = cpu_count
     except Exception:
         pass
     
-    return info
\ No newline at end of file
+    return info
+
+@functools.lru_cache(maxsize=1)
+def _collect_system_info() -> Dict[str, Any]:
+    """采集运行期间不变的系统信息"""
+    
+    system_info = SystemInfo()
+    
+    return {
+        'os_name': system_info.os_name,
+        'os_version': system_info.os_version,
+        'architecture': system_info.architecture,
+        'python_version': system_info.python_version,
+        'distro_name': system_info.get_distro_name(),
+        'distro_version': system_info.get_distro_version(),
+        'kernel_version': _UNAME.release,
+        'hostname': _UNAME.node,
+        'processor': _UNAME.processor,
+        'package_manager': get_package_manager(),
+    }
\ No newline at end of file